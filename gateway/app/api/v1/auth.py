@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Response, Request, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ...schemas.auth import (
@@ -6,20 +7,20 @@ from ...schemas.auth import (
 )
 from ...services.auth_service import AuthService
 from ...deps import current_user
-from ...db.session import get_db
+from ...db.session import get_db, get_async_db
 from ...core.config import settings
 
 router = APIRouter(prefix='/auth', tags=["auth"])
 svc = AuthService()
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(body: RegisterRequest, db: Session = Depends(get_db)):
-    user = svc.register(db, email=body.email, password=body.password, full_name= body.full_name)
+async def register(body: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await svc.register(db, email=body.email, password=body.password, full_name= body.full_name)
     return to_user_out(user)
 
 @router.post("/login", response_model= LoginResponse)
-def login(body: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    svc.login(db, body.email, body.password, response)
+async def login(body: LoginRequest, response: Response, db: AsyncSession = Depends(get_async_db)):
+    await svc.login(db, body.email, body.password, response)
     return LoginResponse(ok = True)
 
 @router.get("/me", response_model=MeResponse)
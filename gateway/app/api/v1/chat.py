@@ -1,11 +1,17 @@
+import asyncio
+import json
 from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Body, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, select, delete as sa_delete
+from sqlalchemy import select, delete as sa_delete
 
-from ...db.session import get_db
+from ...db.session import get_db, get_async_db, SessionLocal
 from ...models.chat import Project, Chat, Message
 from ...schemas.chat import (
     ProjectIn, ProjectOut,
@@ -14,7 +20,16 @@ from ...schemas.chat import (
     CompletionIn, CompletionOut,
 )
 from ...services.llm_facade import LLMFacade
-from ...deps import current_user
+from ...services.llm_service import UNAVAILABLE_REPLY
+from ...services.retry_policy import LLMUnavailableError
+from ...services.chat_context import build_chat_context, fit_to_budget, context_budget
+from ...services.chat_summary import get_summary, maybe_schedule_summary, maybe_schedule_summary_own_session
+from ...services.pagination import InvalidCursor, keyset_page, akeyset_page
+from ...services.json_stream import stream_json, MEDIA_TYPES, NDJSON
+from ...services.chat_ownership import chat_owners, invalidate_chat_owner
+from ...services.project_deletion import not_purging, trash_project, delete_project_hard as purge_project_hard
+from ...core.config import settings
+from ...deps import current_principal, current_principal_async
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -24,35 +39,98 @@ from ...deps import current_user
 def _get_user_project_or_404(db: Session, user, project_id: int) -> Project:
     p = (
         db.query(Project)
-        .filter(Project.id == project_id, Project.user_id == user.id)
+        .filter(Project.id == project_id, Project.user_id == user.id, Project.deleted_at.is_(None))
         .first()
     )
     if not p:
         raise HTTPException(status_code=404, detail="Project not found")
     return p
 
+def _user_chat_select(user, chat_id: int):
+    # владелец денормализован в chats.owner_user_id (проектный чат — владелец проекта,
+    # unassigned — сам пользователь): проверка доступа = один lookup по PK, без join
+    return select(Chat).where(Chat.id == chat_id, Chat.owner_user_id == user.id, not_purging())
+
 def _get_user_chat_or_404(db: Session, user, chat_id: int) -> Chat:
-    """
-    Разрешаем доступ, если:
-      - чат в проекте, который принадлежит пользователю, ИЛИ
-      - чат без проекта, но chat.user_id == user.id
-    """
-    chat = (
-        db.query(Chat)
-        .outerjoin(Project, Project.id == Chat.project_id)
-        .filter(
-            Chat.id == chat_id,
-            (
-                (Project.user_id == user.id)
-                | ((Chat.project_id.is_(None)) & (Chat.user_id == user.id))
-            ),
-        )
-        .first()
-    )
+    chat = db.scalars(_user_chat_select(user, chat_id)).first()
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found")
+    chat_owners.put(chat.id, chat.owner_user_id)
+    return chat
+
+async def _aget_user_chat_or_404(db: AsyncSession, user, chat_id: int) -> Chat:
+    chat = (await db.scalars(_user_chat_select(user, chat_id))).first()
     if not chat:
         raise HTTPException(status_code=404, detail="Chat not found")
+    chat_owners.put(chat.id, chat.owner_user_id)
     return chat
 
+def _ensure_user_chat(db: Session, user, chat_id: int) -> None:
+    """
+    Только проверка доступа (сам чат не нужен): сначала кэш владельцев.
+    Попадание в кэш пропускает фильтр not_purging(): после удаления/переноса
+    чата на другом воркере доступ сохраняется до CHAT_OWNER_CACHE_TTL_SECONDS
+    (см. ChatOwnershipCache). Чтение чата (_get_user_chat_or_404) кэш не использует.
+    """
+    if chat_owners.get(chat_id) == user.id:
+        return
+    owner_id = db.scalar(select(Chat.owner_user_id).where(Chat.id == chat_id, not_purging()))
+    if owner_id is None or owner_id != user.id:
+        raise HTTPException(status_code=404, detail="Chat not found")
+    chat_owners.put(chat_id, owner_id)
+
+async def _aensure_user_chat(db: AsyncSession, user, chat_id: int) -> None:
+    if chat_owners.get(chat_id) == user.id:
+        return
+    owner_id = await db.scalar(select(Chat.owner_user_id).where(Chat.id == chat_id, not_purging()))
+    if owner_id is None or owner_id != user.id:
+        raise HTTPException(status_code=404, detail="Chat not found")
+    chat_owners.put(chat_id, owner_id)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Keyset-пагинация: следующая страница — в заголовке, тело ответа прежнее (список)
+# ──────────────────────────────────────────────────────────────────────────────
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _page_limit(limit: Optional[int], before: Optional[str], after: Optional[str]) -> Optional[int]:
+    # без limit и курсора — вся выборка, как до пагинации (текущий фронтенд курсоры не читает);
+    # курсор без limit — страница по умолчанию
+    if limit is None and (before or after):
+        return settings.PAGE_DEFAULT_LIMIT
+    return limit
+
+def _paginate(response: Response, q, model, *, limit: Optional[int], before: Optional[str],
+              after: Optional[str], newest_first: bool) -> list:
+    limit = _page_limit(limit, before, after)
+    try:
+        rows, next_cursor = keyset_page(
+            q, model.created_at, model.id,
+            limit=limit, before=before, after=after, newest_first=newest_first,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+async def _apaginate(db: AsyncSession, response: Response, stmt, model, *, limit: Optional[int],
+                     before: Optional[str], after: Optional[str], newest_first: bool) -> list:
+    limit = _page_limit(limit, before, after)
+    try:
+        rows, next_cursor = await akeyset_page(
+            db, stmt, model.created_at, model.id,
+            limit=limit, before=before, after=after, newest_first=newest_first,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+def _limit_query():
+    return Query(default=None, ge=1, le=settings.PAGE_MAX_LIMIT)
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Projects
 # ──────────────────────────────────────────────────────────────────────────────
@@ -60,16 +138,16 @@ def _get_user_chat_or_404(db: Session, user, chat_id: int) -> Chat:
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 @router.get("", response_model=List[ProjectOut])
-def list_projects(db: Session = Depends(get_db), user=Depends(current_user)):
+def list_projects(db: Session = Depends(get_db), user=Depends(current_principal)):
     return (
         db.query(Project)
-        .filter(Project.user_id == user.id)
+        .filter(Project.user_id == user.id, Project.deleted_at.is_(None))
         .order_by(Project.created_at.desc(), Project.id.desc())
         .all()
     )
 
 @router.post("", response_model=ProjectOut, status_code=status.HTTP_201_CREATED)
-def create_project(body: ProjectIn, db: Session = Depends(get_db), user=Depends(current_user)):
+def create_project(body: ProjectIn, db: Session = Depends(get_db), user=Depends(current_principal)):
     p = Project(user_id=user.id, name=body.name.strip())
     db.add(p)
     db.commit()
@@ -79,27 +157,32 @@ def create_project(body: ProjectIn, db: Session = Depends(get_db), user=Depends(
 @router.get("/{project_id}/chats", response_model=List[ChatOut])
 def list_chats_in_project(
     project_id: int,
+    response: Response,
     include_deleted: bool = False,
+    limit: Optional[int] = _limit_query(),
+    before: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None),
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     _get_user_project_or_404(db, user, project_id)
     q = db.query(Chat).filter(Chat.project_id == project_id)
     if not include_deleted:
         q = q.filter(Chat.deleted_at.is_(None))
-    return q.order_by(Chat.created_at.desc(), Chat.id.desc()).all()
+    return _paginate(response, q, Chat, limit=limit, before=before, after=after, newest_first=True)
 
 @router.post("/{project_id}/chats", response_model=ChatOut, status_code=status.HTTP_201_CREATED)
 def create_chat_in_project(
     project_id: int,
     body: ChatIn,
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     _get_user_project_or_404(db, user, project_id)
     c = Chat(
         project_id=project_id,
         user_id=None,  # владелец определяется проектом
+        owner_user_id=user.id,
         title=(body.title or "New chat").strip(),
         provider=body.provider or "gemini",
         model=body.model or "gemini-1.5-pro",
@@ -116,42 +199,26 @@ def delete_project(
     project_id: int,
     mode: str = Query(default="hard", pattern="^(hard|trash)$"),
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     """
-    mode=hard  → жёсткое удаление проекта и всех его чатов (сообщения каскадом)
+    mode=hard  → жёсткое удаление проекта и всех его чатов (сообщения каскадом в БД;
+                 большой проект скрывается сразу, данные чистит воркер)
     mode=trash → пометить чаты deleted_at и удалить проект
     """
     _get_user_project_or_404(db, user, project_id)
-    chats = db.query(Chat).filter(Chat.project_id == project_id).all()
 
     if mode == "trash":
-        now = datetime.utcnow()
-        for c in chats:
-            if c.deleted_at is None:
-                c.deleted_at = now
-        # сам проект удаляем
-        p = db.query(Project).filter(Project.id == project_id).first()
-        db.delete(p)
-        db.commit()
+        trash_project(db, project_id)
         return
 
-    # hard
-    for c in chats:
-        db.delete(c)
-    p = db.query(Project).filter(Project.id == project_id).first()
-    db.delete(p)
-    db.commit()
+    purge_project_hard(db, project_id)
     return
 
 @router.delete("/{project_id}/hard", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project_hard(project_id: int, db: Session = Depends(get_db), user=Depends(current_user)):
-    p = _get_user_project_or_404(db, user, project_id)
-    chats = db.query(Chat).filter(Chat.project_id == project_id).all()
-    for c in chats:
-        db.delete(c)   # сообщения уйдут каскадом
-    db.delete(p)
-    db.commit()
+def delete_project_hard(project_id: int, db: Session = Depends(get_db), user=Depends(current_principal)):
+    _get_user_project_or_404(db, user, project_id)
+    purge_project_hard(db, project_id)
     return
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -162,24 +229,23 @@ chats = APIRouter(prefix="/chats", tags=["chats"])
 
 @chats.get("", response_model=List[ChatOut])
 def list_chats(
+    response: Response,
     project_id: Optional[int] = Query(default=None),
     unassigned: bool = Query(default=False),
     include_deleted: bool = Query(default=False),
+    limit: Optional[int] = _limit_query(),
+    before: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None),
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     """
     GET /chats?unassigned=true                 → мои чаты без проекта
     GET /chats?project_id=123                  → чаты моего проекта 123
     GET /chats                                 → все мои чаты (и в проектах, и без), без удалённых
+    Без limit — весь список; с ?limit=N — N новейших, следующая: ?before=<X-Next-Cursor>
     """
-    q = (
-        db.query(Chat)
-        .outerjoin(Project, Project.id == Chat.project_id)
-        .filter(
-            (Project.user_id == user.id) | ((Chat.project_id.is_(None)) & (Chat.user_id == user.id))
-        )
-    )
+    q = db.query(Chat).filter(Chat.owner_user_id == user.id)
 
     if project_id is not None:
         # проверим, что проект мой
@@ -187,22 +253,23 @@ def list_chats(
         q = q.filter(Chat.project_id == project_id)
 
     if unassigned:
-        q = q.filter(Chat.project_id.is_(None), Chat.user_id == user.id)
+        q = q.filter(Chat.project_id.is_(None))
 
     if not include_deleted:
         q = q.filter(Chat.deleted_at.is_(None))
 
-    return q.order_by(Chat.created_at.desc(), Chat.id.desc()).all()
+    return _paginate(response, q, Chat, limit=limit, before=before, after=after, newest_first=True)
 
 @chats.post("", response_model=ChatOut, status_code=status.HTTP_201_CREATED)
 def create_unassigned_chat(
     body: ChatIn,
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     c = Chat(
         project_id=None,
         user_id=user.id,  # ВАЖНО: владелец unassigned-чата — текущий пользователь
+        owner_user_id=user.id,
         title=(body.title or "New chat").strip(),
         provider=body.provider or "gemini",
         model=body.model or "gemini-1.5-pro",
@@ -219,7 +286,7 @@ def update_chat(
     chat_id: int,
     body: ChatUpdate,
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     chat = _get_user_chat_or_404(db, user, chat_id)
 
@@ -229,11 +296,14 @@ def update_chat(
             # перенос в unassigned → чат становится личным
             chat.project_id = None
             chat.user_id = user.id
+            chat.owner_user_id = user.id
         else:
             # перенос в проект пользователя
             p = _get_user_project_or_404(db, user, body.project_id)
             chat.project_id = p.id
             chat.user_id = None  # в проекте владелец определяется проектом
+            chat.owner_user_id = p.user_id
+        invalidate_chat_owner(chat.id)
 
     if body.title is not None:
         new_title = body.title.strip()
@@ -251,7 +321,7 @@ def update_chat(
 def delete_chat_soft(
     chat_id: int,
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     chat = _get_user_chat_or_404(db, user, chat_id)
     if chat.deleted_at is not None:
@@ -264,33 +334,28 @@ def delete_chat_soft(
 def delete_chat_hard(
     chat_id: int,
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     chat = _get_user_chat_or_404(db, user, chat_id)
     db.delete(chat)
     db.commit()
+    invalidate_chat_owner(chat_id)
     return
 
 @chats.get("/trash", response_model=List[ChatOut])
 def list_deleted_chats(
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
-    q = (
-        db.query(Chat)
-        .outerjoin(Project, Project.id == Chat.project_id)
-        .filter(
-            Chat.deleted_at.is_not(None),
-            (Project.user_id == user.id) | ((Chat.project_id.is_(None)) & (Chat.user_id == user.id)),
-        )
-    )
+    # чаты проекта, ожидающего фонового удаления, восстанавливать нельзя — в корзине их нет
+    q = db.query(Chat).filter(Chat.owner_user_id == user.id, Chat.deleted_at.is_not(None), not_purging())
     return q.order_by(Chat.deleted_at.desc(), Chat.id.desc()).all()
 
 @chats.post("/{chat_id}/restore", response_model=ChatOut)
 def restore_chat(
     chat_id: int,
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
     chat = _get_user_chat_or_404(db, user, chat_id)
     chat.deleted_at = None
@@ -303,28 +368,68 @@ def restore_chat(
 # ──────────────────────────────────────────────────────────────────────────────
 
 @chats.get("/{chat_id}/messages", response_model=List[MessageOut])
-def list_messages(
+async def list_messages(
     chat_id: int,
+    response: Response,
+    limit: Optional[int] = _limit_query(),
+    before: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(current_principal_async),
+):
+    """
+    Без параметров — вся история в хронологическом порядке.
+    ?limit=N — последние N сообщений; более старые: ?before=<X-Next-Cursor>;
+    догрузить новые: ?after=<cursor последнего>.
+    """
+    await _aensure_user_chat(db, user, chat_id)
+    stmt = select(Message).where(Message.chat_id == chat_id)
+    return await _apaginate(db, response, stmt, Message, limit=limit, before=before, after=after, newest_first=False)
+
+def _message_row(row) -> dict:
+    # та же форма, что у MessageOut, но без Pydantic-валидации на каждую строку
+    return {
+        "id": row.id,
+        "chat_id": row.chat_id,
+        "role": row.role,
+        "content": row.content,
+        "meta_json": None,
+        "created_at": row.created_at,
+    }
+
+@chats.get("/{chat_id}/export")
+def export_messages(
+    chat_id: int,
+    format: str = Query(default=NDJSON, pattern="^(ndjson|json)$"),
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
-    _get_user_chat_or_404(db, user, chat_id)
-    msgs = (
-        db.query(Message)
-        .filter(Message.chat_id == chat_id)
+    """
+    Вся история чата потоком (NDJSON построчно или JSON-массив) —
+    память не растёт с длиной чата, в отличие от /messages без limit.
+    """
+    chat = _get_user_chat_or_404(db, user, chat_id)
+    stmt = (
+        select(Message.id, Message.chat_id, Message.role, Message.content, Message.created_at)
+        .where(Message.chat_id == chat_id)
         .order_by(Message.created_at.asc(), Message.id.asc())
-        .all()
     )
-    return msgs
+    return StreamingResponse(
+        stream_json(stmt, _message_row, fmt=format, batch_size=settings.EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="chat-{chat.id}.{"ndjson" if format == NDJSON else "json"}"',
+        },
+    )
 
 @chats.post("/{chat_id}/messages", response_model=MessageOut, status_code=status.HTTP_201_CREATED)
-def add_message(
+async def add_message(
     chat_id: int,
     body: MessageIn,
-    db: Session = Depends(get_db),
-    user=Depends(current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(current_principal_async),
 ):
-    _get_user_chat_or_404(db, user, chat_id)
+    await _aensure_user_chat(db, user, chat_id)
     msg = Message(
         chat_id=chat_id,
         role=body.role,
@@ -332,55 +437,168 @@ def add_message(
         created_at=datetime.utcnow(),
     )
     db.add(msg)
-    db.commit()
-    db.refresh(msg)
+    await db.commit()
+    await db.refresh(msg)
+    # хвост чата растёт и от сообщений через API — иначе summary запускался бы с опозданием
+    await run_in_threadpool(maybe_schedule_summary_own_session, chat_id, len(body.content))
     return msg
 
+def _save_assistant_message(chat_id: int, content: str) -> dict:
+    # отдельная сессия: вызывается из threadpool и после закрытия request-сессии
+    with SessionLocal() as db:
+        msg = Message(
+            chat_id=chat_id,
+            role="assistant",
+            content=content,
+            created_at=datetime.utcnow(),
+        )
+        db.add(msg)
+        db.commit()
+        db.refresh(msg)
+        maybe_schedule_summary(db, chat_id, len(content))
+        return MessageOut.model_validate(msg).model_dump(mode="json")
+
+def _context_for(db: Session, llm: LLMFacade, chat_id: int, body: CompletionIn) -> list[dict]:
+    """
+    Без summary — клиентская история в пределах бюджета.
+    С summary — клиент мог прислать лишь страницу истории, поэтому хвост после
+    summary.upto_message_id берём из БД по id; новую реплику пользователя,
+    ещё не сохранённую в чат, добавляем в конец.
+    """
+    budget = context_budget(body.model or llm.model)
+    messages = [m.model_dump() for m in body.messages]
+
+    summary = get_summary(db, chat_id)
+    if summary is None or not summary.summary:
+        return fit_to_budget(messages, budget)
+
+    context = build_chat_context(
+        db, chat_id, budget,
+        summary=summary.summary,
+        after_message_id=summary.upto_message_id,
+    )
+    tail = context[1:]
+    last = messages[-1] if messages else None
+    saved = next((m["content"] for m in reversed(tail) if m["role"] == "user"), None)
+    if last is not None and last["role"] == "user" and last["content"] != saved:
+        return fit_to_budget(tail + [last], budget, summary=summary.summary)
+    return context
+
+def _prepare_completion(db: Session, user, chat_id: int, body: CompletionIn) -> tuple[LLMFacade, list[dict]]:
+    _ensure_user_chat(db, user, chat_id)
+    llm = LLMFacade(db, user.id)
+    return llm, _context_for(db, llm, chat_id, body)
+
 @chats.post("/{chat_id}/completion", response_model=CompletionOut)
-def completion(
+async def completion(
     chat_id: int,
     body: CompletionIn,
     db: Session = Depends(get_db),
-    user=Depends(current_user),
+    user=Depends(current_principal),
 ):
-    _get_user_chat_or_404(db, user, chat_id)
-    llm = LLMFacade(db, user.id)
+    # БД — в threadpool, ожидание LLM — на event loop (поток не занимается)
+    llm, context = await run_in_threadpool(_prepare_completion, db, user, chat_id, body)
+
+    async def save(text: str) -> str:
+        # выполняет только лидер single-flight: одинаковые одновременные запросы
+        # получают одно и то же сохранённое сообщение, а не N копий
+        msg = await run_in_threadpool(_save_assistant_message, chat_id, text)
+        return json.dumps(msg, ensure_ascii=False)
+
+    try:
+        saved = await llm.acomplete(
+            context,
+            chat_id=chat_id,
+            model=body.model,
+            settings=body.settings,
+            finish=save,
+        )
+    except LLMUnavailableError:
+        # все модели недоступны — это не ответ модели, в историю не сохраняем
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=UNAVAILABLE_REPLY)
+    return {"message": json.loads(saved)}
+
+# сохранения, запущенные после обрыва стрима (ссылки держим, чтобы задачи не собрал GC)
+_background_saves: set[asyncio.Task] = set()
+
+def _save_in_background(chat_id: int, content: str) -> None:
+    """await в CancelledError/GeneratorExit уже нельзя — сохраняем в threadpool отдельной задачей."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _save_assistant_message(chat_id, content)
+        return
+    task = loop.create_task(run_in_threadpool(_save_assistant_message, chat_id, content))
+    _background_saves.add(task)
+    task.add_done_callback(_background_saves.discard)
 
-    # Заглушка: ответ строится на основе последнего user-сообщения
-    text = llm.complete(
-        [m.model_dump() for m in body.messages],
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@chats.post("/{chat_id}/completion/stream")
+async def completion_stream(
+    chat_id: int,
+    body: CompletionIn,
+    db: Session = Depends(get_db),
+    user=Depends(current_principal),
+):
+    """
+    SSE-стрим ответа модели:
+      event: delta → {"text": "..."}   — очередной кусок текста
+      event: done  → {"message": {...}} — сохранённое assistant-сообщение
+      event: error → {"message": "..."}  — последнее событие, done после него не будет
+    Сообщение сохраняется один раз: когда модель закончила ответ или когда клиент
+    отключился (сохраняем то, что успели сгенерировать). При ошибке провайдера
+    посреди ответа обрезанный текст не сохраняется — это не законченный ответ.
+    """
+    llm, context = await run_in_threadpool(_prepare_completion, db, user, chat_id, body)
+
+    stream = llm.acomplete_stream(
+        context,
         model=body.model,
         settings=body.settings,
     )
 
-    msg = Message(
-        chat_id=chat_id,
-        role="assistant",
-        content=text,
-        created_at=datetime.utcnow(),
+    async def events():
+        parts: list[str] = []
+        try:
+            async for delta in stream:
+                parts.append(delta)
+                yield _sse("delta", {"text": delta})
+        except (asyncio.CancelledError, GeneratorExit):
+            # клиент отключился: сохраняем то, что успели сгенерировать
+            if parts:
+                _save_in_background(chat_id, "".join(parts))
+            raise
+        except LLMUnavailableError:
+            # все модели недоступны — это не ответ модели, в историю не сохраняем
+            yield _sse("error", {"message": UNAVAILABLE_REPLY})
+            return
+        except Exception:
+            # детали — в лог, клиенту — без внутренностей провайдера
+            logger.exception(f"[ChatStream] completion stream failed for chat {chat_id}")
+            yield _sse("error", {"message": "Failed to generate a reply, please try again."})
+            return
+        if parts:
+            saved = await run_in_threadpool(_save_assistant_message, chat_id, "".join(parts))
+            yield _sse("done", {"message": saved})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    db.add(msg)
-    db.commit()
-    db.refresh(msg)
-    return {"message": msg}
 
 @chats.post("/trash", status_code=status.HTTP_204_NO_CONTENT)
 def empty_trash(
     _ignore: dict | None = Body(default=None),
     db: Session = Depends(get_db),
-    user = Depends(current_user),
+    user = Depends(current_principal),
 ):
     # 1) subquery с ID целевых чатов (без JOIN в delete!)
     chat_ids_sq = (
         db.query(Chat.id)
-        .outerjoin(Project, Project.id == Chat.project_id)
-        .filter(Chat.deleted_at.isnot(None))
-        .filter(
-            or_(
-                and_(Chat.project_id.isnot(None), Project.user_id == user.id),   # чаты в проектах пользователя
-                and_(Chat.project_id.is_(None),   Chat.user_id == user.id),      # одиночные чаты пользователя
-            )
-        )
+        .filter(Chat.owner_user_id == user.id, Chat.deleted_at.isnot(None), not_purging())
         .subquery()
     )
 
@@ -1,12 +1,14 @@
 import os
-import hashlib
-from uuid import uuid4
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from ...core.config import settings
 from ...db.session import get_db
 from ...models.document import Document, DocumentStatus, DocumentChunk
 from ...schemas.document import DocumentOut, DocumentWithChunksOut, DocumentChunkOut
+from ...services.pipeline import reuse_parsed_document
+from ...services.upload_storage import save_upload
 from ...worker.task import parse_document_async
 
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./data/uploads")
@@ -17,30 +19,27 @@ router = APIRouter(prefix="/files", tags=["files"])
 async def upload_file(user_id: int = Form(...),
                       f: UploadFile = File(...),
                       db: Session = Depends(get_db)):
-    # валидация MIME/размера по настройкам
-    data = await f.read()
-    size = len(data)
-    sha256 = hashlib.sha256(data).hexdigest()
-    original = f.filename
-    stored = f"{uuid4().hex}_{original}"
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    path = os.path.join(UPLOAD_DIR, stored)
-    with open(path, "wb") as out:
-        out.write(data)
+    # потоково на диск: размер (413) проверяется по ходу, MIME — по magic bytes
+    up = await save_upload(
+        f, UPLOAD_DIR,
+        max_bytes=settings.UPLOAD_MAX_BYTES,
+        chunk_size=settings.UPLOAD_CHUNK_SIZE,
+    )
 
     doc = Document(
         user_id=user_id,
-        original_name=original,
-        stored_name=stored,
-        mime=f.content_type or "application/octet-stream",
-        size_bytes=size,
-        sha256=sha256,
-        path=path,
+        original_name=f.filename,
+        stored_name=up.stored_name,
+        mime=up.mime,
+        size_bytes=up.size_bytes,
+        sha256=up.sha256,
+        path=up.path,
         status=DocumentStatus.queued.value,
     )
-    db.add(doc)
-    db.commit()
-    db.refresh(doc)
+    # sync Session — вся работа с БД в threadpool, event loop не блокируется
+    reused = await run_in_threadpool(_register_upload, db, doc)
+    if reused:
+        return doc
 
     # отправляем задачу в очередь
     try:
@@ -49,11 +48,22 @@ async def upload_file(user_id: int = Form(...),
         # если брокер недоступен — можно пометить failed или оставить queued и отретраить позже
         doc.status = DocumentStatus.failed.value
         doc.error = f"enqueue failed: {e}"
-        db.commit()
+        await run_in_threadpool(db.commit)
         raise
 
     return doc
 
+def _register_upload(db: Session, doc: Document) -> bool:
+    """Сохраняет документ; True — тот же файл уже разобран и чанки скопированы."""
+    db.add(doc)
+    db.flush()
+
+    # тот же файл уже разобран — чанки копируются в БД, очередь не нужна
+    reused = reuse_parsed_document(db, doc)
+    db.commit()
+    db.refresh(doc)
+    return reused
+
 @router.get("/{doc_id}", response_model=DocumentWithChunksOut)
 def get_document(doc_id: int, db: Session = Depends(get_db)):
     doc = db.query(Document).filter(Document.id == doc_id).first()
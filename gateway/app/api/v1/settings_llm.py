@@ -13,8 +13,8 @@ from ...services.llm_settings import (
     set_api_key,
     has_api_key
 )
-from ...deps import current_user
-from ...models.user import User
+from ...deps import current_principal
+from ...services.auth_cache import Principal
 from ...core.redis_cache import cache_get_json, cache_set_json, cache_delete
 
 def _settings_cache_key(user_id: int) -> str:
@@ -26,7 +26,7 @@ router = APIRouter(prefix="/settings/llm", tags=["llm-settings"])
 @router.get("/", response_model=LlmSettingsOut)
 def get_llm_settings(
         db: Session = Depends(get_db),
-        user: User = Depends(current_user)
+        user: Principal = Depends(current_principal)
 ):
     """
     Get LLM settings for the current user +
@@ -67,7 +67,7 @@ def get_llm_settings(
 def update_llm_settings(
         payload: LlmSettingsUpdate,
         db: Session = Depends(get_db),
-        user: User = Depends(current_user)
+        user: Principal = Depends(current_principal)
 ):
     """
     Update the user's regular (non-secret) LLM settings.
@@ -111,7 +111,7 @@ def update_llm_settings(
 def update_llm_credentials(
         payload: LlmCredentialUpdate,
         db: Session = Depends(get_db),
-        user: User = Depends(current_user)
+        user: Principal = Depends(current_principal)
 ):
     """
     Update provider API keys for the current user.
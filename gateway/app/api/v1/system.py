@@ -1,11 +1,13 @@
 from fastapi import APIRouter
 from ...core.config import settings
 from ...schemas.common import HealthResponse
+from ...services.llm_cache import response_cache
 
 """
 Small router for system endpoints
 - api/v1/system/health -> checks if connection is relevant
 - api/v1/system/version -> shows version of app
+- api/v1/system/llm-cache -> response cache hit/miss stats (this worker)
 """
 
 router = APIRouter(prefix="/system", tags=["system"])
@@ -16,4 +18,8 @@ def health() -> HealthResponse:
 
 @router.get("/version")
 def version():
-    return {"version": settings.APP_VERSION}
\ No newline at end of file
+    return {"version": settings.APP_VERSION}
+
+@router.get("/llm-cache")
+def llm_cache_stats():
+    return {"enabled": settings.LLM_RESPONSE_CACHE_ENABLED, **response_cache.stats()}
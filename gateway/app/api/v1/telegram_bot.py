@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from ...db.session import get_db
@@ -6,18 +7,21 @@ from ...models.telegram_account import TelegramAccount
 from ...schemas.telegram_bot import TelegramMessageRequest, TelegramMessageResponse
 
 from ...services.chat_cli_router import router_user_message
-from ...services.chat_text_pipeline import handle_plain_text
+from ...services.chat_text_pipeline import ahandle_plain_text
 
 router = APIRouter(prefix="/integrations/telegram", tags=["telegram-bot"])
 
-
-@router.post("/message", response_model=TelegramMessageResponse)
-def telegram_message(payload: TelegramMessageRequest, db: Session = Depends(get_db)):
-    acc = (
+def _find_account(db: Session, telegram_id: int) -> TelegramAccount | None:
+    return (
         db.query(TelegramAccount)
-        .filter(TelegramAccount.telegram_id == payload.telegram_id)
+        .filter(TelegramAccount.telegram_id == telegram_id)
         .first()
     )
+
+
+@router.post("/message", response_model=TelegramMessageResponse)
+async def telegram_message(payload: TelegramMessageRequest, db: Session = Depends(get_db)):
+    acc = await run_in_threadpool(_find_account, db, payload.telegram_id)
     if not acc:
         #raise HTTPException(status_code=404, detail="Telegram account not found. Use /link first.")
         return TelegramMessageResponse(
@@ -30,11 +34,11 @@ def telegram_message(payload: TelegramMessageRequest, db: Session = Depends(get_
             reply="Your Telegram is not linked yet. Please use /link <code> (get code on website)."
         )
 
-    cmd_reply = router_user_message(acc, payload.text, db)
+    cmd_reply = await run_in_threadpool(router_user_message, acc, payload.text, db)
     if cmd_reply is not None:
         return TelegramMessageResponse(reply=cmd_reply)
 
-    reply = handle_plain_text(
+    reply = await ahandle_plain_text(
         db,
         user_id=acc.user_id,
         chat_id=getattr(acc, "active_chat_id", None),
@@ -91,6 +91,7 @@ def link_telegram_account(
     if not account.active_chat_id:
         chat = Chat(
             user_id = user.id,
+            owner_user_id = user.id,
             title = f"Telegram chat ({payload.telegram_id})"
         )
         db.add(chat)
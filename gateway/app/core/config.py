@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -32,16 +32,121 @@ class Settings(BaseSettings):
     REFRESH_COOKIE_NAME: str = "refresh_token"
 
     DB_URL: str =  "sqlite:///./data/app.db"
+    # async engine (AsyncSession); empty → derived from DB_URL (aiosqlite / asyncpg)
+    DB_ASYNC_URL: Optional[str] = None
+    # connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+
+    # SQLite tuning applied on connect: "default" (foreign keys only) | "performance"
+    SQLITE_PROFILE: str = "default"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456   # 256 MB
+    SQLITE_CACHE_SIZE: int = -65536     # negative = KiB → 64 MB page cache
+    SQLITE_TEMP_STORE: str = "MEMORY"
 
     GOOGLE_API_KEY: Optional[str] = None
+    # transport для per-user Gemini-клієнтів: grpc | rest (порожньо — дефолт SDK)
+    GEMINI_TRANSPORT: Optional[str] = None
 
     LLM_SETTINGS_SECRET_KEY: Optional[str] = None
+    # key rotation: previous keys (comma-separated), still accepted for decryption
+    LLM_SETTINGS_OLD_SECRET_KEYS: Optional[str] = None
+    # decrypted provider keys kept in memory, keyed by credential id + ciphertext hash
+    LLM_API_KEY_CACHE_SIZE: int = 1024
+    LLM_API_KEY_CACHE_TTL_SECONDS: int = 300
+
+    # LLM client stacks cache (per user, LRU + TTL)
+    LLM_CLIENT_CACHE_SIZE: int = 256
+    LLM_CLIENT_CACHE_TTL_SECONDS: int = 300
+
+    # per-model circuit breakers
+    LLM_BREAKER_WINDOW: int = 20
+    LLM_BREAKER_MIN_CALLS: int = 5
+    LLM_BREAKER_ERROR_RATE: float = 0.5
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 30.0
+
+    # global retry budget: retries may add at most RATIO of request volume
+    LLM_RETRY_BUDGET_RATIO: float = 0.1
+    LLM_RETRY_BUDGET_MIN_PER_SECOND: float = 1.0
+
+    # conversation context window (estimated tokens of history sent per completion)
+    LLM_CONTEXT_TOKEN_BUDGET: int = 8000
+    LLM_CONTEXT_TOKEN_BUDGETS: Dict[str, int] = {
+        "gemini-2.5-pro": 32000,
+        "gemini-2.5-flash": 16000,
+        "gemini-2.5-flash-lite": 8000,
+    }
+
+    # response cache for deterministic (temperature == 0) completions, opt-in
+    LLM_RESPONSE_CACHE_ENABLED: bool = False
+    LLM_RESPONSE_CACHE_SIZE: int = 1024
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    LLM_RESPONSE_CACHE_MAX_CHARS: int = 32000
+
+    # single-flight: identical concurrent completions share one upstream call
+    LLM_SINGLE_FLIGHT_ENABLED: bool = True
+    # also coalesce across workers (Redis lock + short-lived shared result)
+    LLM_SINGLE_FLIGHT_REDIS: bool = False
+    LLM_SINGLE_FLIGHT_LOCK_TTL_SECONDS: int = 120
+    LLM_SINGLE_FLIGHT_RESULT_TTL_SECONDS: int = 30
+
+    # rolling chat summaries (dramatiq worker)
+    CHAT_SUMMARY_TRIGGER_TOKENS: int = 4000
+    CHAT_SUMMARY_KEEP_RECENT: int = 10
+    CHAT_SUMMARY_MAX_BATCH_TOKENS: int = 12000
+    CHAT_SUMMARY_PENDING_TTL_SECONDS: int = 300
+
+    # keyset pagination of chat / message listings
+    PAGE_DEFAULT_LIMIT: int = 100
+    PAGE_MAX_LIMIT: int = 500
+    TELEGRAM_PAGE_LIMIT: int = 20
+    # streamed exports: rows per server-side cursor fetch / response chunk
+    EXPORT_BATCH_SIZE: int = 500
+
+    # per-process chat_id → owner cache for access checks; invalidation is local to
+    # the worker, so other workers may accept writes to a purged chat for up to the TTL
+    CHAT_OWNER_CACHE_SIZE: int = 10000
+    CHAT_OWNER_CACHE_TTL_SECONDS: int = 5
+
+    # per-process cache of verified access tokens → user snapshot (0 disables)
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 60
+
+    # argon2 cost (new hashes only; existing hashes carry their own parameters)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # hashing runs in a dedicated process pool (0 → threadpool); beyond MAX_PENDING
+    # in-flight hash/verify calls per process, register/login answer 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # hard-deleting a project with more messages than this is done by the worker, in chat batches
+    PROJECT_PURGE_ASYNC_MESSAGES: int = 20000
+    PROJECT_PURGE_BATCH_CHATS: int = 200
 
     TELEGRAM_BOT_TOKEN: Optional[str] = None
 
     QUEUE_MODE: str = "dramatiq"
     REDIS_URL: str = "redis: // localhost: 6379 / 0"
+    # app-side Redis clients (caches, breakers): a slow/unreachable Redis fails fast
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 0.5
     UPLOAD_DIR: str ="./ data / uploads"
+    # uploads are streamed to disk in chunks; larger files are rejected with 413
+    UPLOAD_MAX_BYTES: int = 50 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+
+    # PDF text extraction in the worker: page ranges of PAGES_PER_BATCH pages are
+    # parsed by a process pool of at most PARSE_WORKERS (and CPU count) processes
+    PDF_PARSE_WORKERS: int = 4
+    PDF_PAGES_PER_BATCH: int = 20
+    # parsed chunks are written and committed in batches of this size
+    DOCUMENT_CHUNK_BATCH_SIZE: int = 200
 
     @property
     def cors_origins_list(self) -> List[str]:
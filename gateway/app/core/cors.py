@@ -13,4 +13,6 @@ def setup_cors(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # курсор следующей страницы списков (chats/messages)
+        expose_headers=["X-Next-Cursor"],
     )
\ No newline at end of file
@@ -1,20 +1,38 @@
-import os
-from .config import Settings
-from cryptography.fernet import Fernet, InvalidToken
+import hashlib
+from functools import lru_cache
+
+from .config import settings
+from .ttl_cache import TTLCache
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
 
 class EncryptionError(Exception):
     """Generic encryption/decryption error."""
 
-def _get_fernet() -> Fernet:
-    settings = Settings()
-    key = settings.LLM_SETTINGS_SECRET_KEY
-    if not key:
-        raise EncryptionError("LLM_SETTINGS_SECRET_KEY is not set in environment.")
+def _fernet(key: str) -> Fernet:
     try:
-        return Fernet(key.encode() if isinstance(key, str) else key)
+        return Fernet(key.strip().encode())
     except Exception as exc:
         raise EncryptionError("Invalid LLM_SETTINGS_SECRET_KEY format.") from exc
 
+@lru_cache(maxsize=1)
+def _get_fernet() -> MultiFernet:
+    """
+    Cipher is built once per process (no Settings()/.env re-read per call).
+    Encrypts with LLM_SETTINGS_SECRET_KEY, decrypts with it or any of
+    LLM_SETTINGS_OLD_SECRET_KEYS — rotation = new key in LLM_SETTINGS_SECRET_KEY, old one
+    moved here; keys get re-encrypted with the new one whenever they are saved again.
+    """
+    key = settings.LLM_SETTINGS_SECRET_KEY
+    if not key:
+        raise EncryptionError("LLM_SETTINGS_SECRET_KEY is not set in environment.")
+    old_keys = [k for k in (settings.LLM_SETTINGS_OLD_SECRET_KEYS or "").split(",") if k.strip()]
+    return MultiFernet([_fernet(key)] + [_fernet(k) for k in old_keys])
+
+def reset_fernet() -> None:
+    """Drop the cached cipher and decrypted keys (after changing secret keys at runtime)."""
+    _get_fernet.cache_clear()
+    _decrypted.clear()
+
 def encrypt_api_key(plain:str) -> str:
     """
     Encrypt API key (or any sensitive string) using Fernet.
@@ -37,4 +55,24 @@ def decrypt_api_key(ciphertext:str) -> str:
         plain_bytes = f.decrypt(ciphertext.encode("ascii"))
     except InvalidToken as exc:
         raise EncryptionError("Invalid ciphertext or wrong secret key.") from exc
-    return plain_bytes.decode("utf-8")
\ No newline at end of file
+    return plain_bytes.decode("utf-8")
+
+
+# Short-lived in-memory cache of decrypted keys: (credential id, sha256(ciphertext)) → plain.
+# A re-saved key has new ciphertext, so stale entries are never hit; TTL and size
+# bound how long / how many plaintext keys stay in process memory.
+_decrypted: "TTLCache[str]" = TTLCache(
+    maxsize=settings.LLM_API_KEY_CACHE_SIZE,
+    ttl_seconds=settings.LLM_API_KEY_CACHE_TTL_SECONDS,
+)
+
+def decrypt_api_key_cached(credential_id: int, ciphertext: str) -> str:
+    """decrypt_api_key with the short-lived cache above (hot completion path)."""
+    if not ciphertext:
+        raise EncryptionError("Empty ciphertext")
+    key = (credential_id, hashlib.sha256(ciphertext.encode("ascii")).hexdigest())
+    plain = _decrypted.get(key)
+    if plain is None:
+        plain = decrypt_api_key(ciphertext)
+        _decrypted.put(key, plain)
+    return plain
@@ -1,9 +1,25 @@
+import asyncio
 import os
 import json
+import weakref
 from typing import Any, Optional
 import redis
+import redis.asyncio
+
+from .config import settings
 
 _redis_client: Optional["redis.Redis"] = None
+# redis.asyncio connections are bound to the loop they were opened on
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.asyncio.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _client_options() -> dict:
+    return {
+        "decode_responses": True,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        "socket_connect_timeout": settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+    }
 
 def get_redis() -> Optional["redis.Redis"]:
     """
@@ -23,9 +39,25 @@ def get_redis() -> Optional["redis.Redis"]:
     if not url:
         return None
 
-    _redis_client = redis.from_url(url, decode_responses = True)
+    _redis_client = redis.from_url(url, **_client_options())
     return _redis_client
 
+def get_async_redis() -> Optional["redis.asyncio.Redis"]:
+    """
+    redis.asyncio client for the running event loop (one per loop), same timeouts
+    as get_redis(). Use it on async paths so Redis round trips don't block the loop.
+    None when REDIS_URL is not set.
+    """
+    url = os.getenv("REDIS_URL")
+    if not url:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = redis.asyncio.from_url(url, **_client_options())
+        _async_clients[loop] = client
+    return client
+
 def cache_get_json(key:str) -> Optional[dict]:
     r = get_redis()
     if r is None:
@@ -7,7 +7,13 @@ from fastapi import Response
 
 from .config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto") # bcrypt_sha256 | argon2
+pwd_context = CryptContext(
+    schemes=["argon2"],  # bcrypt_sha256 | argon2
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
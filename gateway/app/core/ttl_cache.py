@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+class TTLCache(Generic[V]):
+    """
+    Thread-safe in-process LRU + TTL map, shared by the local caches
+    (LLM client stacks, LLM responses, chat owners, access tokens, decrypted keys).
+
+    Entries past maxsize are evicted least-recently-used first; maxsize <= 0
+    disables the cache. `clock` is time.monotonic unless callers pass absolute
+    expiry times to put() (e.g. a JWT exp) — then use time.time.
+    """
+    def __init__(self, maxsize: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._items: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < self._clock():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: V, expires_at: Optional[float] = None) -> None:
+        """expires_at (same clock) can only shorten the TTL, never extend it."""
+        if self.maxsize <= 0:
+            return
+        deadline = self._clock() + self.ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._items[key] = (deadline, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def pop(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._items.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [k for k in self._items if predicate(k)]:
+                del self._items[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
@@ -0,0 +1,36 @@
+# app/db/migrate.py
+"""
+Schema migrations (Alembic) — an explicit step before the API / worker start:
+
+    python -m app.db.migrate
+
+Databases created earlier by Base.metadata.create_all have tables but no
+alembic_version: they are stamped with the baseline revision first, then upgraded.
+"""
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from .session import engine
+
+BASELINE_REVISION = "0001"
+
+_GATEWAY_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def alembic_config() -> Config:
+    cfg = Config(os.path.join(_GATEWAY_DIR, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(_GATEWAY_DIR, "app", "db", "migrations"))
+    return cfg
+
+def upgrade_to_head() -> None:
+    cfg = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables and "users" in tables:
+        print(f"[Migrate] legacy create_all database → stamp {BASELINE_REVISION}")
+        command.stamp(cfg, BASELINE_REVISION)
+    command.upgrade(cfg, "head")
+
+if __name__ == "__main__":
+    upgrade_to_head()
@@ -0,0 +1,65 @@
+# app/db/migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import engine
+
+# все модели должны быть импортированы, чтобы попасть в Base.metadata (autogenerate)
+from app.models import chat, document, llm_credentials, llm_settings, telegram_account, user  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# SQLite не умеет ALTER COLUMN/ADD CONSTRAINT — alembic пересобирает таблицу (batch mode)
+render_as_batch = settings.DB_URL.startswith("sqlite")
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=settings.DB_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=render_as_batch,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    # тот же engine, что у приложения (pragmas, пул)
+    with engine.connect() as connection:
+        if render_as_batch:
+            # batch mode пересобирает таблицу (copy → DROP → rename); с foreign_keys=ON
+            # DROP TABLE каскадно удалил бы строки дочерних таблиц (messages, chat_summaries...).
+            # PRAGMA действует только вне транзакции — выставляем до begin_transaction()
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+        try:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                render_as_batch=render_as_batch,
+            )
+            with context.begin_transaction():
+                context.run_migrations()
+                if render_as_batch:
+                    # FK не проверялись во время миграции — проверяем целостность до коммита
+                    violations = connection.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+                    if violations:
+                        raise RuntimeError(f"foreign key violations after migration: {violations[:10]}")
+        finally:
+            if render_as_batch:
+                # соединение вернётся в пул приложения — включаем FK обратно
+                connection.rollback()
+                connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+                connection.commit()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
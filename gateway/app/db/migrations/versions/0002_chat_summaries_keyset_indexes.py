@@ -0,0 +1,53 @@
+"""chat summaries table and keyset pagination indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 17:20:04.118302
+
+Databases that booted with create_all after these models were added may
+already have the table / indexes, so everything here is created only if missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = [
+    ('chats', 'ix_chats_project_created_id', ['project_id', 'created_at', 'id']),
+    ('chats', 'ix_chats_user_created_id', ['user_id', 'created_at', 'id']),
+    ('messages', 'ix_messages_chat_created_id', ['chat_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('chat_summaries'):
+        op.create_table('chat_summaries',
+        sa.Column('chat_id', sa.Integer(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('upto_message_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['chat_id'], ['chats.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('chat_id')
+        )
+
+    for table, name, columns in _INDEXES:
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.create_index(name, columns, unique=False)
+
+
+def downgrade() -> None:
+    for table, name, _ in reversed(_INDEXES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(name)
+
+    op.drop_table('chat_summaries')
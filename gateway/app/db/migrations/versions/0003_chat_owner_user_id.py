@@ -0,0 +1,46 @@
+"""denormalized chats.owner_user_id
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 17:31:47.502915
+
+Owner of a chat = owner of its project, or chats.user_id for unassigned chats.
+Backfilled here; the app keeps it in sync on chat create / move.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('owner_user_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_chats_owner_user_id_users', 'users', ['owner_user_id'], ['id'], ondelete='CASCADE'
+        )
+
+    op.execute(
+        """
+        UPDATE chats SET owner_user_id = COALESCE(
+            (SELECT projects.user_id FROM projects WHERE projects.id = chats.project_id),
+            chats.user_id
+        )
+        """
+    )
+
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.create_index('ix_chats_owner_created_id', ['owner_user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.drop_index('ix_chats_owner_created_id')
+        batch_op.drop_constraint('fk_chats_owner_user_id_users', type_='foreignkey')
+        batch_op.drop_column('owner_user_id')
@@ -0,0 +1,31 @@
+"""projects.deleted_at for background project purge
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 18:02:11.384120
+
+Large projects are hidden by deleted_at on hard delete and removed
+by the purge_project_async worker actor in batches.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_projects_deleted_at'), ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_projects_deleted_at'))
+        batch_op.drop_column('deleted_at')
@@ -0,0 +1,32 @@
+"""drop ix_chats_user_created_id
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 21:40:27.613094
+
+Chat listings and access checks filter by owner_user_id
+(ix_chats_owner_created_id) since 0003; nothing orders chats by user_id any
+more, and the users FK cascade on chats.user_id is covered by ix_chats_user_id.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('chats')}
+    if 'ix_chats_user_created_id' in existing:
+        with op.batch_alter_table('chats', schema=None) as batch_op:
+            batch_op.drop_index('ix_chats_user_created_id')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.create_index('ix_chats_user_created_id', ['user_id', 'created_at', 'id'], unique=False)
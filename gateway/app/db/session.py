@@ -1,24 +1,62 @@
+from typing import TYPE_CHECKING, AsyncIterator
+
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 is_sqlite = settings.DB_URL.startswith("sqlite")
 
+def _pool_kwargs() -> dict:
+    # SQLite-файл: пул не нужен (одна запись за раз), остальным — настраиваемый QueuePool
+    if is_sqlite:
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
 #
 engine = create_engine(
     settings.DB_URL,
     connect_args={"check_same_thread": False} if is_sqlite else {},
+    **_pool_kwargs(),
 )
 
+def _sqlite_pragmas() -> list[str]:
+    """
+    SQLITE_PROFILE=performance: WAL (читатели не блокируют писателя, API и dramatiq-воркер
+    пишут параллельно), synchronous=NORMAL (безопасно в WAL), busy_timeout вместо
+    мгновенного "database is locked", плюс mmap / page cache / temp в памяти.
+    """
+    pragmas = ["PRAGMA foreign_keys=ON"]
+    if settings.SQLITE_PROFILE == "performance":
+        pragmas += [
+            "PRAGMA journal_mode=WAL",
+            f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+            f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+            f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+            f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}",
+            f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+        ]
+    return pragmas
+
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
-    # включаем FK только для SQLite; для Postgres/MySQL этот PRAGMA игнорируется
+    # PRAGMA только для SQLite; для Postgres/MySQL ничего не делаем
+    if not is_sqlite:
+        return
     try:
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for pragma in _sqlite_pragmas():
+            cursor.execute(pragma)
         cursor.close()
-    except Exception:
-        pass
+    except Exception as e:
+        print(f"[DB] SQLite pragmas failed: {e}")
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit = False)
 
@@ -28,4 +66,60 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Async (опционально): AsyncSession для async-роутов, чтобы запросы к БД
+# не занимали потоки threadpool. Движок создаётся лениво при первом использовании,
+# так что без aiosqlite/asyncpg sync-часть приложения работает как раньше.
+# ──────────────────────────────────────────────────────────────────────────────
+
+_async_engine = None
+_async_session_factory = None
+
+def _async_url(url: str) -> str:
+    """sqlite:// → sqlite+aiosqlite://, postgresql:// → postgresql+asyncpg://"""
+    scheme, sep, rest = url.partition("://")
+    base = scheme.split("+", 1)[0]
+    if base == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if base in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            settings.DB_ASYNC_URL or _async_url(settings.DB_URL),
+            **_pool_kwargs(),
+        )
+        if is_sqlite:
+            event.listen(_async_engine.sync_engine, "connect", set_sqlite_pragma)
+    return _async_engine
+
+def AsyncSessionLocal():
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # expire_on_commit=False: после commit атрибуты читаются без ленивой
+        # подгрузки (в async она недоступна)
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False,
+        )
+    return _async_session_factory()
+
+# Dependency (async)
+async def get_async_db() -> AsyncIterator["AsyncSession"]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
@@ -1,32 +1,76 @@
 from fastapi import Request, HTTPException, status, Depends
 from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .core.config import settings
 from .core.security import decode_token
-from .db.session import get_db
+from .db.session import get_db, get_async_db
 from .models.user import User
+from .services.auth_cache import Principal, token_cache
 
 def get_request_id(request: Request) -> str | None:
     return getattr(request.state, "request_id", None)
 
-def current_user(request: Request, db:Session = Depends(get_db)) -> User:
+def _access_token(request: Request) -> str:
     token = request.cookies.get(settings.ACCESS_COOKIE_NAME)
 
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail= "Missing access token")
+    return token
+
+def _access_payload(token: str) -> dict:
     try:
         payload = decode_token(token)
-        if payload.get("type") != "access":
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
-                                detail= "Invalid token type")
-        sub = payload.get("sub")
-        user = db.get(User, int(sub))
-        if not user or not user.is_active:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
-                                detail="User not found")
-        return user
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
-                            detail="Invalid or expired token")
\ No newline at end of file
+                            detail="Invalid or expired token")
+    if payload.get("type") != "access":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                            detail= "Invalid token type")
+    return payload
+
+def _user_id_from_token(request: Request) -> int:
+    token = _access_token(request)
+    # уже проверенный токен — без повторной проверки подписи
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.id
+    return int(_access_payload(token).get("sub"))
+
+def _active_or_401(user: User | None) -> User:
+    if not user or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                            detail="User not found")
+    return user
+
+def _remember(token: str, payload: dict, user: User) -> Principal:
+    principal = Principal(id=user.id, role=user.role, is_active=user.is_active)
+    token_cache.put(token, principal, payload.get("exp"))
+    return principal
+
+def current_user(request: Request, db:Session = Depends(get_db)) -> User:
+    return _active_or_401(db.get(User, _user_id_from_token(request)))
+
+def current_principal(request: Request, db: Session = Depends(get_db)) -> Principal:
+    """
+    Для hot-эндпоинтов, которым нужен только id/role: повторный запрос с тем же
+    токеном не проверяет подпись JWT и не читает users (сессия БД не открывает соединение).
+    """
+    token = _access_token(request)
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    payload = _access_payload(token)
+    user = _active_or_401(db.get(User, int(payload.get("sub"))))
+    return _remember(token, payload, user)
+
+async def current_principal_async(request: Request, db: AsyncSession = Depends(get_async_db)) -> Principal:
+    token = _access_token(request)
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    payload = _access_payload(token)
+    user = _active_or_401(await db.get(User, int(payload.get("sub"))))
+    return _remember(token, payload, user)
@@ -7,23 +7,41 @@ from .core.cors import setup_cors
 from .core.logging import setup_logging
 from .core.config import settings
 from .middlewares.request_id import RequestIDMiddleware
+from .middlewares.body_limit import BodySizeLimitMiddleware, MULTIPART_OVERHEAD_BYTES
 from .schemas.common import ErrorResponse, ErrorDetail
 from .api.v1.routes import api_router
 
-# DB
-from .db.session import engine
-from .db.base import Base
-
-# db connection
-Base.metadata.create_all(bind=engine)
+# DB: схема создаётся миграциями (python -m app.db.migrate), а не при импорте
+from .db.session import dispose_async_engine
+from .services.password_hasher import password_hasher
+from .services.project_deletion import resume_project_purges
 
 setup_logging()
 app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION)
 
 # middleware
+# upload size is enforced while the body arrives, not after Starlette has spooled it;
+# added first = innermost, so its 413 is not wrapped by the BaseHTTPMiddleware task group
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD_BYTES,
+    paths=("/api/v1/files/upload",),
+)
 app.add_middleware(RequestIDMiddleware)
 setup_cors(app)
 
+@app.on_event("startup")
+def _resume_project_purges():
+    resume_project_purges()
+
+@app.on_event("shutdown")
+async def _close_async_db():
+    await dispose_async_engine()
+
+@app.on_event("shutdown")
+def _close_password_hasher():
+    password_hasher.shutdown()
+
 # system root ping
 @app.get("/health")
 def root_health():
@@ -36,7 +54,8 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         error=ErrorDetail(code=str(exc.status_code), message=exc.detail),
         request_id=rid,
     )
-    return JSONResponse(status_code=exc.status_code, content=body.model_dump())
+    return JSONResponse(status_code=exc.status_code, content=body.model_dump(),
+                        headers=getattr(exc, "headers", None))
 
 @app.exception_handler(RequestValidationError)
 async def validation_exceptiom_handler(request: Request, exc: RequestValidationError):
@@ -0,0 +1,59 @@
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..schemas.common import ErrorResponse, ErrorDetail
+
+# multipart boundaries, part headers and small form fields on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class BodySizeLimitMiddleware:
+    """
+    Caps the request body of the given paths before the app reads it.
+
+    Starlette spools the whole multipart body to a temp file before the handler
+    runs, so a limit checked inside the handler only fires after the client has
+    sent everything. Here a Content-Length above the cap is rejected with 413
+    without reading the body, and a chunked body is cut off with 413 as soon as
+    the received bytes cross the cap.
+    """
+    def __init__(self, app: ASGIApp, max_bytes: int, paths: tuple[str, ...]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        length = headers.get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            body = ErrorResponse(
+                error=ErrorDetail(code="413", message=self._detail()),
+                request_id=scope.get("state", {}).get("request_id"),
+            )
+            response = JSONResponse(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                    content=body.model_dump(), headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # handled by the app's HTTPException handler like any other 413
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                        detail=self._detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _detail(self) -> str:
+        return f"Request body is larger than {self.max_bytes} bytes"
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Integer, ForeignKey, DateTime, String, Text, JSON
+from sqlalchemy import Integer, ForeignKey, DateTime, String, Text, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.base import Base
@@ -18,6 +18,8 @@ class Project(Base):
     )
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # Проект в процессе фонового удаления (purge_project_async): скрыт из списков и доступа
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, default=None, index=True)
 
     # relationships
     user: Mapped["User"] = relationship("User", back_populates="projects")
@@ -31,7 +33,13 @@ class Project(Base):
 
 class Chat(Base):
     __tablename__ = "chats"
-    __table_args__ = {"sqlite_autoincrement": True}
+    __table_args__ = (
+        # keyset-пагинация списков: WHERE project_id ORDER BY created_at, id
+        Index("ix_chats_project_created_id", "project_id", "created_at", "id"),
+        # проверки доступа и «мои чаты» (все / unassigned): WHERE owner_user_id = ? ORDER BY created_at, id
+        Index("ix_chats_owner_created_id", "owner_user_id", "created_at", "id"),
+        {"sqlite_autoincrement": True},
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
     # Владелец unassigned-чата (для проектных чатов владелец берётся из Project.user_id)
@@ -47,6 +55,13 @@ class Chat(Base):
         nullable=True,
     )
 
+    # Денормализованный владелец: Project.user_id для проектных чатов, user_id — для unassigned.
+    # Выставляется при создании и переносе чата; доступ проверяется одним равенством.
+    owner_user_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
     title: Mapped[str] = mapped_column(String(200), nullable=False, default="New chat")
     provider: Mapped[str] = mapped_column(String(50), default="gemini", nullable=False)
     model: Mapped[str] = mapped_column(String(100), default="gemini-2.5-flash", nullable=False)
@@ -67,6 +82,10 @@ class Chat(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # история чата страницами по (created_at, id)
+        Index("ix_messages_chat_created_id", "chat_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     chat_id: Mapped[int] = mapped_column(
@@ -79,3 +98,20 @@ class Message(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     chat: Mapped["Chat"] = relationship("Chat", back_populates="messages")
+
+
+class ChatSummary(Base):
+    """
+    Rolling summary of a chat: everything up to (and including) upto_message_id
+    is folded into `summary`, completions send summary + the newer tail.
+    Kept in its own table so it is maintained by the worker without touching chats rows.
+    """
+    __tablename__ = "chat_summaries"
+
+    chat_id: Mapped[int] = mapped_column(
+        ForeignKey("chats.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    summary: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    upto_message_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
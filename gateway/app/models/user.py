@@ -35,6 +35,7 @@ class User(Base):
         back_populates="user",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        foreign_keys="Chat.user_id",
     )
     telegram_accounts: Mapped[list["TelegramAccount"]] = relationship(
         back_populates="user",
@@ -0,0 +1,48 @@
+# app/services/auth_cache.py
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from ..core.config import settings
+from ..core.ttl_cache import TTLCache
+
+@dataclass(frozen=True)
+class Principal:
+    """Знімок користувача для hot-ендпоінтів: без ORM-об'єкта і без сесії БД."""
+    id: int
+    role: str
+    is_active: bool
+
+def token_key(token: str) -> str:
+    # сам токен у пам'яті не тримаємо — лише його хеш
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+class TokenCache:
+    """
+    sha256(access token) → Principal у пам'яті процесу (LRU + TTL).
+    Запис живе не довше за exp токена, тож прострочений токен з кешу не пройде.
+
+    Явної інвалідації немає: відкликання access-токенів у застосунку немає й без кешу
+    (logout лише чистить cookies, токен валідний до exp), а is_active/role ніде
+    не змінюються. Якщо з'явиться деактивація чи зміна ролі — тоді й додати
+    інвалідацію; до того розбіжність обмежена TTL.
+    """
+    def __init__(self, maxsize: int = 10000, ttl_seconds: float = 60):
+        # time.time: термін запису обрізається exp токена (unix time)
+        self._items: "TTLCache[Principal]" = TTLCache(maxsize, ttl_seconds, clock=time.time)
+
+    def get(self, token: str) -> Optional[Principal]:
+        return self._items.get(token_key(token))
+
+    def put(self, token: str, principal: Principal, token_exp: Optional[float] = None) -> None:
+        if principal.is_active:
+            self._items.put(token_key(token), principal, expires_at=token_exp)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+token_cache = TokenCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
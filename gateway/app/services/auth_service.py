@@ -1,34 +1,37 @@
 from fastapi import HTTPException, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from ..core.security import (
-    verify_password, create_access_token, create_refresh_token,
-    set_auth_cookies, clear_auth_cookies, decode_token, hash_password
+    create_access_token, create_refresh_token,
+    set_auth_cookies, clear_auth_cookies, decode_token
 )
 from ..models.user import User
+from .password_hasher import password_hasher
 
 class AuthService:
-    def register(self, db: Session, email:str, password:str, full_name: str | None) -> User:
-        existing = db.scalar(select(User).where(User.email == email.lower()))
+    # register/login — async: argon2 уходит в пул процессов password_hasher
+    async def register(self, db: AsyncSession, email:str, password:str, full_name: str | None) -> User:
+        existing = await db.scalar(select(User).where(User.email == email.lower()))
         if existing:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                                 detail="Email already registered")
 
         user = User(
             email = email.lower(),
-            password_hash=hash_password(password),
+            password_hash=await password_hasher.hash(password),
             full_name=full_name,
             role = "user",
             is_active = True
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         return user
 
-    def login(self, db: Session, email:str, password: str, response: Response) -> None:
-        user = db.scalar(select(User).where(User.email == email.lower()))
-        if not user or not verify_password(password, user.password_hash) or not user.is_active:
+    async def login(self, db: AsyncSession, email:str, password: str, response: Response) -> None:
+        user = await db.scalar(select(User).where(User.email == email.lower()))
+        if not user or not await password_hasher.verify(password, user.password_hash) or not user.is_active:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail="Invalid credentials")
         access = create_access_token(str(user.id))
@@ -3,7 +3,11 @@ from types import SimpleNamespace
 
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
 from ..models.chat import Project, Chat, Message
+from .pagination import InvalidCursor, keyset_page
+from .chat_ownership import invalidate_chat_owner
+from .project_deletion import trash_project, delete_project_hard
 from ..api.v1.chat import _get_user_chat_or_404, _get_user_project_or_404
 
 def _ensure_linked_user(channel_user) -> SimpleNamespace:
@@ -60,8 +64,8 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
             "- chat move <chat_id> <project_id>\n"
             "- chat delete <chat_id>\n"
             "- chat delete hard <chat_id>\n"
-            "- chat open <chat_id>\n"
-            "- chat list\n"
+            "- chat open <chat_id> [cursor]\n"
+            "- chat list [cursor]\n"
             "- use project <project_id>\n"
             "- use chat <chat_id>\n"
         )
@@ -87,16 +91,11 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
             return "Usage: project delete hard <id>"
 
         pid = int(rest)
-        p = _get_user_project_or_404(db, user, pid)
-
-        chats = db.query(Chat).filter(Chat.project_id == pid).all()
-        for c in chats:
-            db.delete(c)
-        db.delete(p)
-        db.commit()
+        _get_user_project_or_404(db, user, pid)
 
-        if getattr(chanel_user, "active_project_id", None) == pid:
-            _set_active_project(db, chanel_user, None)
+        # the service also resets active_project_id / active_chat_id of Telegram accounts
+        if delete_project_hard(db, pid):
+            return f"Project {pid} is being HARD-deleted in background"
 
         return f"Project {pid} and all its chats were HARD-deleted"
 
@@ -107,19 +106,8 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
             return "Usage: project delete <id>"
 
         pid = int(rest)
-        p = _get_user_project_or_404(db, user, pid)
-
-        now = datetime.utcnow()
-        chats = db.query(Chat).filter(Chat.project_id == pid).all()
-        for c in chats:
-            if getattr(c, "deleted_at", None) is None:
-                c.deleted_at = now
-
-        db.delete(p)
-        db.commit()
-
-        if getattr(chanel_user, "active_project_id", None) == pid:
-            _set_active_project(db, chanel_user, None)
+        _get_user_project_or_404(db, user, pid)
+        trash_project(db, pid)
 
         return f"Project {pid} deleted (its chats moved to trash)"
 
@@ -127,7 +115,7 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
     if norm == ("project list"):
         projects = (
             db.query(Project)
-            .filter(Project.user_id == user.id)
+            .filter(Project.user_id == user.id, Project.deleted_at.is_(None))
             .order_by(Project.created_at.desc(), Project.id.desc())
             .all()
         )
@@ -154,6 +142,7 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
         c = Chat(
             project_id=pid,
             user_id=chanel_user.user_id,
+            owner_user_id=user.id,
             title=(title or "New chat").strip(),
             settings_json=None,
             created_at=datetime.utcnow(),
@@ -183,8 +172,10 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
         project = _get_user_project_or_404(db, user, pid)
 
         chat.project_id = project.id
+        chat.owner_user_id = project.user_id
         db.commit()
         db.refresh(chat)
+        invalidate_chat_owner(chat.id)
 
         # if getattr(chanel_user, "active_chat_id", None) == cid:
         #     _set_active_chat(db,chanel_user,project.id)
@@ -201,6 +192,7 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
         chat = _get_user_chat_or_404(db, user, cid)
         db.delete(chat)
         db.commit()
+        invalidate_chat_owner(cid)
 
         if getattr(chanel_user, "active_chat_id", None) == cid:
             _set_active_chat(db, chanel_user, None)
@@ -223,20 +215,27 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
         db.commit()
         return f"Chat {cid} moved to trash."
 
-    # chat open <chat_id>
+    # chat open <chat_id> [cursor]
     if norm.startswith("chat open "):
-        rest = norm[len("chat open "):].strip()
-        if not rest.isdigit():
-            return "Usage: chat open <chat_id>"
-        cid = int(rest)
+        # курсор регистрозависимый — берём из raw, а не из norm
+        parts = raw.split()
+        if len(parts) not in (3, 4) or not parts[2].isdigit():
+            return "Usage: chat open <chat_id> [cursor]"
+        cid = int(parts[2])
+        cursor = parts[3] if len(parts) == 4 else None
         chat = _get_user_chat_or_404(db, user, cid)
 
-        msgs = (
-            db.query(Message)
-            .filter(Message.chat_id == cid)
-            .order_by(Message.created_at.asc(), Message.id.asc())
-            .all()
-        )
+        # последние N сообщений (или более старые — по курсору), а не вся история
+        try:
+            msgs, next_cursor = keyset_page(
+                db.query(Message).filter(Message.chat_id == cid),
+                Message.created_at, Message.id,
+                limit=settings.TELEGRAM_PAGE_LIMIT,
+                before=cursor,
+                newest_first=False,
+            )
+        except InvalidCursor:
+            return "Invalid cursor."
         _set_active_chat(db, chanel_user, cid)
         lines = [f"chat [{chat.id}] '{chat.title}':"]
         if not msgs:
@@ -245,20 +244,26 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
             for m in msgs:
                 ts = m.created_at.strftime("%Y-%m-%d %H:%M")
                 lines.append(f"[{ts}] {m.role}: {m.content}")
+        if next_cursor:
+            lines.append(f"Older messages: chat open {cid} {next_cursor}")
         return "\n".join(lines)
 
-    # chat list
-    if norm == "chat list":
-        chats = (
-            db.query(Chat)
-            .outerjoin(Project, Chat.project_id == Project.id)
-            .filter(
-                (Project.user_id == user.id) |
-                ((Chat.project_id.is_(None)) & (Chat.user_id == user.id))
+    # chat list [cursor]
+    if norm == "chat list" or norm.startswith("chat list "):
+        parts = raw.split()
+        if len(parts) > 3:
+            return "Usage: chat list [cursor]"
+        cursor = parts[2] if len(parts) == 3 else None
+        try:
+            chats, next_cursor = keyset_page(
+                db.query(Chat).filter(Chat.owner_user_id == user.id),
+                Chat.created_at, Chat.id,
+                limit=settings.TELEGRAM_PAGE_LIMIT,
+                before=cursor,
+                newest_first=True,
             )
-            .order_by(Chat.id.asc())
-            .all()
-        )
+        except InvalidCursor:
+            return "Invalid cursor."
 
         if not chats:
             return "No chats found."
@@ -270,7 +275,8 @@ def router_user_message(chanel_user, text: str, db:Session) -> str:
             else:
                 lines.append(f"[{c.id}] {c.title} (no project)")
 
-        lines.append(f"Total: {len(chats)}")
+        if next_cursor:
+            lines.append(f"More: chat list {next_cursor}")
         return "\n".join(lines)
 
     # ----------------- Use -----------------
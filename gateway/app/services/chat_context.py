@@ -0,0 +1,99 @@
+# app/services/chat_context.py
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.chat import Message
+
+# грубо: ~4 символи на токен + службові токени на кожну репліку
+CHARS_PER_TOKEN = 4
+_MESSAGE_OVERHEAD = 4
+_PAGE_SIZE = 64
+
+def estimate_tokens(text: str) -> int:
+    """Дешева оцінка без токенайзера — для бюджету цього достатньо."""
+    return len(text or "") // CHARS_PER_TOKEN + _MESSAGE_OVERHEAD
+
+def context_budget(model: Optional[str]) -> int:
+    """Бюджет токенів на історію для моделі (LLM_CONTEXT_TOKEN_BUDGETS → дефолт)."""
+    budgets = settings.LLM_CONTEXT_TOKEN_BUDGETS
+    if model and model in budgets:
+        return budgets[model]
+    return settings.LLM_CONTEXT_TOKEN_BUDGET
+
+def _summary_message(summary: str) -> Dict[str, str]:
+    return {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
+
+def fit_to_budget(
+    messages: List[Dict[str, str]],
+    budget: int,
+    *,
+    summary: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """
+    Залишає найсвіжіші повідомлення, що влазять у budget (хронологічний порядок).
+    Останнє повідомлення береться завжди — навіть якщо саме по собі більше за бюджет.
+    Якщо є summary — воно йде першим і теж займає бюджет.
+    """
+    head = [_summary_message(summary)] if summary else []
+    used = sum(estimate_tokens(m["content"]) for m in head)
+
+    picked: List[Dict[str, str]] = []
+    for m in reversed(messages):
+        cost = estimate_tokens(m.get("content", ""))
+        if picked and used + cost > budget:
+            break
+        picked.append(m)
+        used += cost
+    picked.reverse()
+    return head + picked
+
+def build_chat_context(
+    db: Session,
+    chat_id: int,
+    budget: int,
+    *,
+    summary: Optional[str] = None,
+    after_message_id: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """
+    Читає історію чату з кінця сторінками (keyset по created_at, id),
+    доки не набереться budget — без .all() по всьому чату.
+    after_message_id — повідомлення до нього (включно) вже покриті summary.
+    """
+    head = [_summary_message(summary)] if summary else []
+    used = sum(estimate_tokens(m["content"]) for m in head)
+
+    picked: List[Dict[str, str]] = []
+    cursor = None
+    while True:
+        q = (
+            db.query(Message.id, Message.role, Message.content, Message.created_at)
+            .filter(Message.chat_id == chat_id)
+        )
+        if after_message_id is not None:
+            q = q.filter(Message.id > after_message_id)
+        if cursor is not None:
+            created_at, mid = cursor
+            q = q.filter(or_(
+                Message.created_at < created_at,
+                and_(Message.created_at == created_at, Message.id < mid),
+            ))
+        rows = q.order_by(Message.created_at.desc(), Message.id.desc()).limit(_PAGE_SIZE).all()
+
+        for row in rows:
+            cost = estimate_tokens(row.content)
+            if picked and used + cost > budget:
+                picked.reverse()
+                return head + picked
+            picked.append({"role": row.role, "content": row.content})
+            used += cost
+
+        if len(rows) < _PAGE_SIZE:
+            break
+        cursor = (rows[-1].created_at, rows[-1].id)
+
+    picked.reverse()
+    return head + picked
@@ -0,0 +1,37 @@
+# app/services/chat_ownership.py
+from typing import Optional
+
+from ..core.config import settings
+from ..core.ttl_cache import TTLCache
+
+class ChatOwnershipCache:
+    """
+    chat_id → owner_user_id у пам'яті процесу (LRU + короткий TTL).
+    Власник чату змінюється лише разом з видаленням/переносом — там і інвалідуємо,
+    але тільки в поточному процесі: кеш не спільний. На інших uvicorn-воркерах
+    запис живе до кінця TTL — стільки чат проекту, що чекає purge (чи видалений
+    чат), ще приймає запис через _ensure_user_chat. Тому TTL — секунди, не хвилини.
+    """
+    def __init__(self, maxsize: int = 10000, ttl_seconds: float = 5):
+        self._items: "TTLCache[int]" = TTLCache(maxsize, ttl_seconds)
+
+    def get(self, chat_id: int) -> Optional[int]:
+        return self._items.get(chat_id)
+
+    def put(self, chat_id: int, owner_id: Optional[int]) -> None:
+        if owner_id is not None:
+            self._items.put(chat_id, owner_id)
+
+    def invalidate(self, *chat_ids: int) -> None:
+        self._items.pop(*chat_ids)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+chat_owners = ChatOwnershipCache(
+    maxsize=settings.CHAT_OWNER_CACHE_SIZE,
+    ttl_seconds=settings.CHAT_OWNER_CACHE_TTL_SECONDS,
+)
+
+def invalidate_chat_owner(*chat_ids: int) -> None:
+    chat_owners.invalidate(*chat_ids)
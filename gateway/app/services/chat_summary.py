@@ -0,0 +1,186 @@
+# app/services/chat_summary.py
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.redis_cache import get_redis
+from ..db.session import SessionLocal
+from ..models.chat import Chat, ChatSummary, Message
+from .chat_context import CHARS_PER_TOKEN, estimate_tokens
+from .llm_facade import LLMFacade
+from .retry_policy import LLMUnavailableError
+
+_SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an assistant.\n"
+    "Update the summary with the new messages below. Keep facts, decisions, names, numbers "
+    "and open questions; drop small talk. Answer with the updated summary only.\n\n"
+    "Current summary:\n{summary}\n\n"
+    "New messages:\n{transcript}"
+)
+
+# чати, для яких задача вже в черзі (fallback, коли Redis недоступний)
+_pending_local: dict[int, float] = {}
+# лічильник символів не згорнутого хвоста (fallback, коли Redis недоступний)
+_tail_local: dict[int, int] = {}
+_TAIL_TTL_SECONDS = 7 * 24 * 3600
+
+def get_summary(db: Session, chat_id: int) -> Optional[ChatSummary]:
+    return db.get(ChatSummary, chat_id)
+
+def _claim_pending(chat_id: int) -> bool:
+    """Не ставимо в чергу той самий чат вдруге, поки попередня задача не відпрацювала."""
+    ttl = settings.CHAT_SUMMARY_PENDING_TTL_SECONDS
+    r = get_redis()
+    if r is not None:
+        try:
+            return bool(r.set(f"chat:{chat_id}:summary_pending", "1", nx=True, ex=ttl))
+        except Exception:
+            pass
+    now = time.monotonic()
+    if _pending_local.get(chat_id, 0) > now:
+        return False
+    _pending_local[chat_id] = now + ttl
+    return True
+
+def _release_pending(chat_id: int) -> None:
+    _pending_local.pop(chat_id, None)
+    r = get_redis()
+    if r is not None:
+        try:
+            r.delete(f"chat:{chat_id}:summary_pending")
+        except Exception:
+            pass
+
+def _tail_key(chat_id: int) -> str:
+    return f"chat:{chat_id}:summary_tail_chars"
+
+def _tail_chars_exact(db: Session, chat_id: int) -> int:
+    s = get_summary(db, chat_id)
+    upto = s.upto_message_id if s else 0
+    chars = (
+        db.query(func.coalesce(func.sum(func.length(Message.content)), 0))
+        .filter(Message.chat_id == chat_id, Message.id > upto)
+        .scalar()
+    )
+    return int(chars)
+
+def _set_tail_chars(chat_id: int, chars: int) -> None:
+    _tail_local[chat_id] = chars
+    r = get_redis()
+    if r is not None:
+        try:
+            r.set(_tail_key(chat_id), chars, ex=_TAIL_TTL_SECONDS)
+        except Exception:
+            pass
+
+def _add_tail_chars(db: Session, chat_id: int, added: int) -> int:
+    """
+    Поточний розмір хвоста в символах. Лічильник ведеться інкрементально
+    (Redis INCRBY, інакше — у процесі); SUM по БД лише для ініціалізації,
+    коли лічильника ще немає (новий процес / протух ключ).
+    """
+    r = get_redis()
+    if r is not None:
+        try:
+            key = _tail_key(chat_id)
+            pipe = r.pipeline()
+            pipe.incrby(key, added)
+            pipe.expire(key, _TAIL_TTL_SECONDS)
+            total = int(pipe.execute()[0])
+            if total == added:
+                total = _tail_chars_exact(db, chat_id)
+                r.set(key, total, ex=_TAIL_TTL_SECONDS)
+            return total
+        except Exception:
+            pass
+    if chat_id not in _tail_local:
+        _tail_local[chat_id] = _tail_chars_exact(db, chat_id)
+    else:
+        _tail_local[chat_id] += added
+    return _tail_local[chat_id]
+
+def maybe_schedule_summary(db: Session, chat_id: int, added_chars: int) -> None:
+    """
+    Дешева перевірка після нового повідомлення (added_chars — його довжина):
+    якщо не згорнутий у summary хвіст перевищив поріг — ставимо summarize_chat_async
+    у dramatiq. Запит не блокується; БД не читається, поки лічильник нижче порогу.
+    """
+    chars = _add_tail_chars(db, chat_id, added_chars)
+    if chars // CHARS_PER_TOKEN < settings.CHAT_SUMMARY_TRIGGER_TOKENS:
+        return
+    if not _claim_pending(chat_id):
+        return
+    try:
+        from ..worker.task import summarize_chat_async
+        summarize_chat_async.send(chat_id)
+    except Exception as e:
+        _release_pending(chat_id)
+        print(f"[ChatSummary] enqueue failed for chat {chat_id}: {e}")
+
+def maybe_schedule_summary_own_session(chat_id: int, added_chars: int) -> None:
+    """
+    maybe_schedule_summary зі своєю sync-сесією — для async-роутів з AsyncSession
+    (викликати через run_in_threadpool). Сесія відкриває з'єднання, лише якщо
+    лічильник треба ініціалізувати з БД.
+    """
+    with SessionLocal() as db:
+        maybe_schedule_summary(db, chat_id, added_chars)
+
+def update_chat_summary(chat_id: int) -> None:
+    """
+    Worker-side: згортає найстаріші не згорнуті повідомлення в summary.
+    Останні CHAT_SUMMARY_KEEP_RECENT повідомлень лишаються «сирими» —
+    вони й так потрапляють у контекст дослівно.
+    """
+    db: Session = SessionLocal()
+    try:
+        chat = db.get(Chat, chat_id)
+        if chat is None:
+            return
+        owner_id = chat.owner_user_id
+        if owner_id is None:
+            return
+
+        s = get_summary(db, chat_id) or ChatSummary(chat_id=chat_id, summary="", upto_message_id=0)
+
+        tail = (
+            db.query(Message.id, Message.role, Message.content)
+            .filter(Message.chat_id == chat_id, Message.id > s.upto_message_id)
+            .order_by(Message.id.asc())
+            .all()
+        )
+        foldable = tail[: max(0, len(tail) - settings.CHAT_SUMMARY_KEEP_RECENT)]
+
+        batch, used = [], 0
+        for row in foldable:
+            cost = estimate_tokens(row.content)
+            if batch and used + cost > settings.CHAT_SUMMARY_MAX_BATCH_TOKENS:
+                break
+            batch.append(row)
+            used += cost
+        if not batch:
+            return
+
+        transcript = "\n".join(f"{row.role}: {row.content}" for row in batch)
+        prompt = _SUMMARY_PROMPT.format(summary=s.summary or "(empty)", transcript=transcript)
+        try:
+            text = LLMFacade(db, owner_id).complete([{"role": "user", "content": prompt}]).strip()
+        except LLMUnavailableError:
+            return
+        if not text:
+            return
+
+        s.summary = text
+        s.upto_message_id = batch[-1].id
+        s.updated_at = datetime.utcnow()
+        db.add(s)
+        db.commit()
+        _set_tail_chars(chat_id, sum(len(row.content) for row in tail[len(batch):]))
+        print(f"[ChatSummary] chat {chat_id}: folded {len(batch)} messages (upto id {s.upto_message_id})")
+    finally:
+        _release_pending(chat_id)
+        db.close()
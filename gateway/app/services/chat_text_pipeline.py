@@ -1,8 +1,20 @@
 from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from ..models.chat import Message, Chat
 from ..schemas.chat import CompletionIn, MessageIn
 from ..services.llm_facade import LLMFacade
+from ..services.llm_service import UNAVAILABLE_REPLY
+from ..services.retry_policy import LLMUnavailableError
+from ..services.chat_context import build_chat_context, context_budget
+from ..services.chat_summary import get_summary, maybe_schedule_summary
+
+NO_ACTIVE_CHAT_REPLY = (
+    "No active chat.\n"
+    "Use:\n"
+    "- chat new <project_id> <title>\n"
+    "- use chat <chat_id>"
+)
 
 def handle_plain_text(
     db: Session,
@@ -15,19 +27,49 @@ def handle_plain_text(
     Processes plain text (NOT a command):
     1) Ensures chat_id is present
     2) Saves Message(role=‘user’)
-    3) Calls histoty of messages
+    3) Loads the most recent history that fits the model's token budget
     4) Calls LLM (PLACEHOLDER for now)
     5) Returns the response
     """
 
     if chat_id is None:
-        return (
-            "No active chat.\n"
-            "Use:\n"
-            "- chat new <project_id> <title>\n"
-            "- use chat <chat_id>"
-        )
+        return NO_ACTIVE_CHAT_REPLY
+
+    facade = LLMFacade(
+        db=db,
+        user_id=user_id,
+    )
+    messages_for_llm = _store_and_load_history(db, chat_id, text, context_budget(facade.model))
+
+    try:
+        return facade.complete(chat_id=chat_id, messages=messages_for_llm)
+    except LLMUnavailableError:
+        return UNAVAILABLE_REPLY
+
+async def ahandle_plain_text(
+    db: Session,
+    *,
+    user_id: int,
+    chat_id: int | None,
+    text: str,
+) -> str:
+    """
+    Async variant of handle_plain_text: DB work goes to the threadpool,
+    while waiting for the LLM happens on the event loop.
+    """
+    if chat_id is None:
+        return NO_ACTIVE_CHAT_REPLY
 
+    facade = await run_in_threadpool(LLMFacade, db, user_id)
+    messages_for_llm = await run_in_threadpool(
+        _store_and_load_history, db, chat_id, text, context_budget(facade.model)
+    )
+    try:
+        return await facade.acomplete(chat_id=chat_id, messages=messages_for_llm)
+    except LLMUnavailableError:
+        return UNAVAILABLE_REPLY
+
+def _store_and_load_history(db: Session, chat_id: int, text: str, budget: int) -> list[dict]:
     user_msg = Message(
         chat_id=chat_id,
         role="user",
@@ -37,19 +79,14 @@ def handle_plain_text(
     db.add(user_msg)
     db.commit()
 
-    messages = (
-        db.query(Message)
-        .filter(Message.chat_id == chat_id)
-        .order_by(Message.created_at.asc(), Message.id.asc())
-        .all()
-    )
-
-    messages_for_llm = [{"role": m.role, "content": m.content} for m in messages]
+    maybe_schedule_summary(db, chat_id, len(text))
 
-    facade = LLMFacade(
-        db=db,
-        user_id=user_id,
-    )
-    reply = facade.complete(chat_id=chat_id, messages=messages_for_llm)
-
-    return reply
\ No newline at end of file
+    # summary (якщо є) + лише свіжий хвіст історії в межах бюджету токенів моделі
+    summary = get_summary(db, chat_id)
+    if summary is not None and summary.summary:
+        return build_chat_context(
+            db, chat_id, budget,
+            summary=summary.summary,
+            after_message_id=summary.upto_message_id,
+        )
+    return build_chat_context(db, chat_id, budget)
\ No newline at end of file
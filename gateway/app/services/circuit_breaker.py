@@ -0,0 +1,335 @@
+# app/services/circuit_breaker.py
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.redis_cache import get_async_redis, get_redis
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+Outcome = Tuple[bool, float]  # (ok, latency_seconds)
+
+Snapshot = Dict[str, Tuple[dict, List[Outcome]]]  # name → (state hash, rolling outcomes)
+
+class _MemoryBackend:
+    """Стан брейкерів у пам'яті процесу (коли Redis недоступний)."""
+    def __init__(self, window: int):
+        self.window = window
+        self._state: Dict[str, dict] = {}
+        self._calls: Dict[str, deque] = {}
+        self._probes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self, names: List[str]) -> Snapshot:
+        with self._lock:
+            return {
+                name: (dict(self._state.get(name) or {}), list(self._calls.get(name) or []))
+                for name in names
+            }
+
+    def push_outcome(self, name: str, ok: bool, latency: float) -> Tuple[dict, List[Outcome]]:
+        with self._lock:
+            calls = self._calls.setdefault(name, deque(maxlen=self.window))
+            calls.append((ok, latency))
+            return dict(self._state.get(name) or {}), list(calls)
+
+    def close(self, name: str) -> None:
+        with self._lock:
+            self._state.setdefault(name, {}).update(state=CLOSED, opened_at=0)
+            self._calls.pop(name, None)
+            self._probes.pop(name, None)
+
+    def trip(self, name: str, opened_at: float) -> None:
+        with self._lock:
+            self._state.setdefault(name, {}).update(state=OPEN, opened_at=opened_at)
+            self._probes.pop(name, None)
+
+    def try_acquire_probe(self, name: str, ttl: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._probes.get(name, 0) > now:
+                return False
+            self._probes[name] = now + ttl
+            return True
+
+class _RedisBackend:
+    """
+    Стан брейкерів у Redis — спільний для всіх воркерів.
+    Кожна операція — один pipeline (один round trip). r — sync-клієнт;
+    _AsyncRedisBackend — те саме для redis.asyncio.
+    """
+    def __init__(self, r, window: int):
+        self.r = r
+        self.window = window
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return f"llm:cb:{name}"
+
+    # --- побудова pipeline'ів (спільна для sync/async) ---
+    def _snapshot_pipe(self, names: List[str]):
+        pipe = self.r.pipeline(transaction=False)
+        for name in names:
+            pipe.hgetall(self._key(name))
+            pipe.lrange(f"{self._key(name)}:calls", 0, -1)
+        return pipe
+
+    def _snapshot_result(self, names: List[str], raw: list) -> Snapshot:
+        return {
+            name: (self._state(raw[2 * i]), [self._parse(x) for x in raw[2 * i + 1]])
+            for i, name in enumerate(names)
+        }
+
+    def _push_pipe(self, name: str, ok: bool, latency: float):
+        key = f"{self._key(name)}:calls"
+        pipe = self.r.pipeline()
+        pipe.rpush(key, f"{int(ok)}|{latency:.4f}")
+        pipe.ltrim(key, -self.window, -1)
+        pipe.lrange(key, 0, -1)
+        pipe.hgetall(self._key(name))
+        return pipe
+
+    def _push_result(self, raw: list) -> Tuple[dict, List[Outcome]]:
+        *_, calls, state = raw
+        return self._state(state), [self._parse(x) for x in calls]
+
+    def _close_pipe(self, name: str):
+        pipe = self.r.pipeline()
+        pipe.hset(self._key(name), mapping={"state": CLOSED, "opened_at": "0"})
+        pipe.delete(f"{self._key(name)}:calls", f"{self._key(name)}:probe")
+        return pipe
+
+    def _trip_pipe(self, name: str, opened_at: float):
+        pipe = self.r.pipeline()
+        pipe.hset(self._key(name), mapping={"state": OPEN, "opened_at": str(opened_at)})
+        pipe.delete(f"{self._key(name)}:probe")
+        return pipe
+
+    # --- sync API ---
+    def snapshot(self, names: List[str]) -> Snapshot:
+        return self._snapshot_result(names, self._snapshot_pipe(names).execute())
+
+    def push_outcome(self, name: str, ok: bool, latency: float) -> Tuple[dict, List[Outcome]]:
+        return self._push_result(self._push_pipe(name, ok, latency).execute())
+
+    def close(self, name: str) -> None:
+        self._close_pipe(name).execute()
+
+    def trip(self, name: str, opened_at: float) -> None:
+        self._trip_pipe(name, opened_at).execute()
+
+    def try_acquire_probe(self, name: str, ttl: float) -> bool:
+        return bool(self.r.set(f"{self._key(name)}:probe", "1", nx=True, px=int(ttl * 1000)))
+
+    @staticmethod
+    def _state(raw: Optional[dict]) -> dict:
+        state = dict(raw or {})
+        if "opened_at" in state:
+            state["opened_at"] = float(state["opened_at"])
+        return state
+
+    @staticmethod
+    def _parse(raw: str) -> Outcome:
+        ok, latency = raw.split("|", 1)
+        return ok == "1", float(latency)
+
+class _AsyncRedisBackend(_RedisBackend):
+    """Ті самі pipeline'и через redis.asyncio — event loop не блокується."""
+    async def snapshot(self, names: List[str]) -> Snapshot:
+        return self._snapshot_result(names, await self._snapshot_pipe(names).execute())
+
+    async def push_outcome(self, name: str, ok: bool, latency: float) -> Tuple[dict, List[Outcome]]:
+        return self._push_result(await self._push_pipe(name, ok, latency).execute())
+
+    async def close(self, name: str) -> None:
+        await self._close_pipe(name).execute()
+
+    async def trip(self, name: str, opened_at: float) -> None:
+        await self._trip_pipe(name, opened_at).execute()
+
+    async def try_acquire_probe(self, name: str, ttl: float) -> bool:
+        return bool(await self.r.set(f"{self._key(name)}:probe", "1", nx=True, px=int(ttl * 1000)))
+
+class CircuitBreakerRegistry:
+    """
+    Per-model circuit breakers (closed → open → half_open → closed)
+    з rolling-статистикою помилок і латентності.
+
+    - closed: запити йдуть; якщо у вікні >= min_calls і частка помилок >= error_rate → open
+    - open: модель пропускається одразу, без очікування таймауту
+    - half_open: після cooldown пропускаємо один пробний запит; успіх → closed, помилка → open
+
+    Стан лежить у Redis, якщо він налаштований (спільний для воркерів), інакше — у пам'яті.
+    LLMService, LLMRouter і RetryDecorator дивляться в один і той самий реєстр.
+    На запит: один pipelined read (order) + один pipeline на результат виклику.
+    Методи з префіксом a* — для async-шляхів (redis.asyncio).
+    """
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        cooldown_seconds: float = 30.0,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown_seconds = cooldown_seconds
+        self._memory = _MemoryBackend(window)
+
+    def _backend(self):
+        r = get_redis()
+        return _RedisBackend(r, self.window) if r is not None else self._memory
+
+    def _call(self, method: str, *args, **kw):
+        try:
+            return getattr(self._backend(), method)(*args, **kw)
+        except Exception:
+            # Redis впав — деградуємо до локального стану, а не валимо запит
+            return getattr(self._memory, method)(*args, **kw)
+
+    async def _acall(self, method: str, *args, **kw):
+        r = get_async_redis()
+        if r is not None:
+            try:
+                return await getattr(_AsyncRedisBackend(r, self.window), method)(*args, **kw)
+            except Exception:
+                pass
+        return getattr(self._memory, method)(*args, **kw)
+
+    # --------- рішення за знімком стану (без I/O) ---------
+    def _state_of(self, st: dict) -> str:
+        state = st.get("state", CLOSED)
+        if state == OPEN and time.time() - float(st.get("opened_at", 0)) >= self.cooldown_seconds:
+            return HALF_OPEN
+        return state
+
+    @staticmethod
+    def _stats_of(state: str, calls: List[Outcome]) -> dict:
+        if not calls:
+            return {"state": state, "calls": 0, "error_rate": 0.0, "avg_latency": 0.0}
+        failures = sum(1 for ok, _ in calls if not ok)
+        return {
+            "state": state,
+            "calls": len(calls),
+            "error_rate": failures / len(calls),
+            "avg_latency": sum(lat for _, lat in calls) / len(calls),
+        }
+
+    @staticmethod
+    def _health_of(st: dict) -> float:
+        if st["state"] == OPEN:
+            return 0.0
+        return (1.0 - st["error_rate"]) / (1.0 + st["avg_latency"] / 10.0)
+
+    def _order_from(self, candidates: List[str], snap: Snapshot) -> List[Tuple[str, str]]:
+        states = {name: self._state_of(st) for name, (st, _) in snap.items()}
+        main, fallbacks = candidates[0], list(dict.fromkeys(candidates[1:]))
+        fallbacks = [m for m in fallbacks if m != main and states[m] != OPEN]
+        fallbacks.sort(key=lambda m: self._health_of(self._stats_of(states[m], snap[m][1])), reverse=True)
+        picked = ([main] if states[main] != OPEN else []) + fallbacks
+        return [(m, states[m]) for m in picked]
+
+    def _should_trip(self, st: dict, calls: List[Outcome]) -> bool:
+        if st.get("state", CLOSED) != CLOSED:
+            # провалена проба в half_open (або помилка в open) — знову відкриваємо
+            return True
+        failures = sum(1 for ok, _ in calls if not ok)
+        return len(calls) >= self.min_calls and failures / len(calls) >= self.error_rate
+
+    # --------- state ---------
+    def state(self, name: str) -> str:
+        st, _ = self._call("snapshot", [name])[name]
+        return self._state_of(st)
+
+    def available(self, name: str) -> bool:
+        """Чи варто взагалі пробувати модель (без побічних ефектів)."""
+        return self.state(name) != OPEN
+
+    async def aavailable(self, name: str) -> bool:
+        st, _ = (await self._acall("snapshot", [name]))[name]
+        return self._state_of(st) != OPEN
+
+    def acquire(self, name: str, state: Optional[str] = None) -> bool:
+        """
+        Дозвіл на виклик. У half_open лише один запит (на всі воркери з Redis)
+        отримує право на пробу, решта — пропускають модель.
+        state — уже відомий стан (з order()), щоб не читати його вдруге.
+        """
+        state = state or self.state(name)
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        return bool(self._call("try_acquire_probe", name, self.cooldown_seconds))
+
+    async def aacquire(self, name: str, state: str) -> bool:
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        return bool(await self._acall("try_acquire_probe", name, self.cooldown_seconds))
+
+    # --------- outcomes ---------
+    def record_success(self, name: str, latency: float) -> None:
+        st, _ = self._call("push_outcome", name, True, latency)
+        if st.get("state", CLOSED) != CLOSED:
+            # модель ожила: закриваємо і починаємо вікно заново, щоб старі помилки не відкрили її знову
+            self._call("close", name)
+
+    async def arecord_success(self, name: str, latency: float) -> None:
+        st, _ = await self._acall("push_outcome", name, True, latency)
+        if st.get("state", CLOSED) != CLOSED:
+            await self._acall("close", name)
+
+    def record_failure(self, name: str, latency: float) -> None:
+        st, calls = self._call("push_outcome", name, False, latency)
+        if self._should_trip(st, calls):
+            print(f"[CircuitBreaker] {name} → open")
+            self._call("trip", name, time.time())
+
+    async def arecord_failure(self, name: str, latency: float) -> None:
+        st, calls = await self._acall("push_outcome", name, False, latency)
+        if self._should_trip(st, calls):
+            print(f"[CircuitBreaker] {name} → open")
+            await self._acall("trip", name, time.time())
+
+    # --------- health ---------
+    def stats(self, name: str) -> dict:
+        st, calls = self._call("snapshot", [name])[name]
+        return self._stats_of(self._state_of(st), calls)
+
+    def health(self, name: str) -> float:
+        """0..1: вище — краще. Частка успіхів, зменшена за повільність."""
+        return self._health_of(self.stats(name))
+
+    def order(self, candidates: List[str]) -> List[Tuple[str, str]]:
+        """
+        Основна модель лишається першою (якщо не open), запасні сортуються за health.
+        Моделі з відкритим брейкером відкидаються одразу.
+        Повертає [(модель, стан)] — стан передається в acquire() без повторного читання.
+        """
+        if not candidates:
+            return []
+        return self._order_from(candidates, self._call("snapshot", list(dict.fromkeys(candidates))))
+
+    async def aorder(self, candidates: List[str]) -> List[Tuple[str, str]]:
+        if not candidates:
+            return []
+        snap = await self._acall("snapshot", list(dict.fromkeys(candidates)))
+        return self._order_from(candidates, snap)
+
+breakers = CircuitBreakerRegistry(
+    window=settings.LLM_BREAKER_WINDOW,
+    min_calls=settings.LLM_BREAKER_MIN_CALLS,
+    error_rate=settings.LLM_BREAKER_ERROR_RATE,
+    cooldown_seconds=settings.LLM_BREAKER_COOLDOWN_SECONDS,
+)
+
+def breaker_name(client) -> Optional[str]:
+    """Ім'я моделі, за якою LLMClient-обгортки шукають брейкер."""
+    return getattr(client, "model", None)
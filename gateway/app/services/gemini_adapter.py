@@ -1,5 +1,5 @@
 # app/services/gemini_adapter.py
-from typing import Iterable, Dict, List, Any
+from typing import Iterable, AsyncIterator, Dict, List, Any, Optional
 from sqlalchemy.orm import Session
 from .llm_port import LLMClient
 from .llm_service import LLMService
@@ -9,16 +9,44 @@ class GeminiAdapter(LLMClient):
         self.inner = LLMService(db, user_id)
         self.model = model
 
+    def fingerprint(self, **kw) -> Optional[Dict[str, Any]]:
+        return {
+            "provider": "gemini",
+            "model": self.model,
+            "generation_config": self.inner._generation_config(
+                kw.get("settings") or kw.get("settings_dict")
+            ),
+        }
+
     def generate(self, prompt: str, **kw) -> str:
         # оборачиваем prompt в формат history из одной user-реплики
         messages = [{"role": "user", "content": prompt}]
-        return self.inner.complete(messages, model=self.model, settings=kw.get("settings"))
+        return self.inner.complete(
+            messages,
+            model=self.model,
+            settings_dict=kw.get("settings") or kw.get("settings_dict")
+        )
 
     def chat_stream(self, messages: List[Dict[str, str]], **kw) -> Iterable[str]:
-        # у нас пока нет реального стриминга — возвращаем одним чанком
-        text = self.inner.complete(
+        # реальный стриминг: чанки идут по мере генерации Gemini
+        yield from self.inner.chat_stream(
             messages,
             model=self.model,
             settings_dict=kw.get("settings") or kw.get("settings_dict")
         )
-        yield text
+
+    async def agenerate(self, prompt: str, **kw) -> str:
+        messages = [{"role": "user", "content": prompt}]
+        return await self.inner.acomplete(
+            messages,
+            model=self.model,
+            settings_dict=kw.get("settings") or kw.get("settings_dict")
+        )
+
+    async def achat_stream(self, messages: List[Dict[str, str]], **kw) -> AsyncIterator[str]:
+        async for chunk in self.inner.achat_stream(
+            messages,
+            model=self.model,
+            settings_dict=kw.get("settings") or kw.get("settings_dict")
+        ):
+            yield chunk
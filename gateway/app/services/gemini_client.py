@@ -0,0 +1,76 @@
+# app/services/gemini_client.py
+import threading
+from typing import Optional
+
+import google.generativeai as genai
+from google.generativeai import client as genai_client
+
+from ..core.config import settings
+
+# версії google-generativeai, на яких перевірено приватне API нижче (major, minor)
+_SDK_TESTED_VERSIONS = {(0, 8)}
+
+# Публічного способу дати моделі власний ключ у SDK немає, тому нижче — приватне API
+# google-generativeai. Версію SDK перевіряємо при створенні клієнта: після оновлення
+# SDK запит падає з RuntimeError, а не йде тихо з глобальним (чужим) ключем.
+
+def _check_sdk_version() -> None:
+    version = tuple(int(p) for p in genai.__version__.split(".")[:2] if p.isdigit())
+    if version not in _SDK_TESTED_VERSIONS:
+        raise RuntimeError(
+            f"google-generativeai {genai.__version__} is not supported by GeminiClient "
+            f"(tested: {sorted(_SDK_TESTED_VERSIONS)}); re-check the private API it uses"
+        )
+
+def _new_client_manager(api_key: str, transport: str):
+    """Свій _ClientManager — та сама фабрика клієнтів, що й у genai.configure."""
+    manager_cls = getattr(genai_client, "_ClientManager", None)
+    if manager_cls is None:
+        raise RuntimeError("google.generativeai.client._ClientManager is gone")
+    manager = manager_cls()
+    manager.configure(api_key=api_key, transport=transport)
+    return manager
+
+def _bind_client(llm: genai.GenerativeModel, client, is_async: bool) -> genai.GenerativeModel:
+    # GenerativeModel бере default-клієнт лише якщо це поле порожнє
+    attr = "_async_client" if is_async else "_client"
+    if attr not in vars(llm):
+        raise RuntimeError(f"GenerativeModel.{attr} is gone")
+    setattr(llm, attr, client)
+    return llm
+
+class GeminiClient:
+    """
+    Gemini-клієнт з власними credentials і транспортом.
+
+    genai.configure() змінює глобальний стан модуля, тож при паралельних
+    запитах різних користувачів один запит міг піти з чужим ключем.
+    Тут кожен інстанс має свій _ClientManager (та сама фабрика, що й у
+    genai.configure), а моделі отримують його sync/async клієнти напряму —
+    глобальний стан SDK не чіпається взагалі. Приватне API — лише в
+    _new_client_manager / _bind_client.
+    """
+    def __init__(self, api_key: str, transport: Optional[str] = None):
+        if not api_key:
+            raise ValueError("api_key is required")
+        _check_sdk_version()
+        self._manager = _new_client_manager(api_key, transport or settings.GEMINI_TRANSPORT)
+        self._lock = threading.Lock()
+
+    def _get(self, name: str):
+        with self._lock:
+            return self._manager.get_default_client(name)
+
+    @property
+    def client(self):
+        return self._get("generative")
+
+    @property
+    def async_client(self):
+        return self._get("generative_async")
+
+    def model(self, name: str, generation_config: dict, *, is_async: bool = False) -> genai.GenerativeModel:
+        llm = genai.GenerativeModel(name, generation_config=generation_config)
+        # async-клієнт (grpc_asyncio) створюємо тільки з event loop
+        client = self.async_client if is_async else self.client
+        return _bind_client(llm, client, is_async)
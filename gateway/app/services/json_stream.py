@@ -0,0 +1,55 @@
+# app/services/json_stream.py
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import Select
+
+from ..db.session import SessionLocal
+
+NDJSON = "ndjson"
+JSON_ARRAY = "json"
+
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    JSON_ARRAY: "application/json",
+}
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def stream_json(
+    stmt: Select,
+    serialize: Callable[[Any], dict],
+    *,
+    fmt: str = NDJSON,
+    batch_size: int = 500,
+) -> Iterator[bytes]:
+    """
+    Віддає результат запиту шматками (NDJSON або JSON-масив), не тримаючи весь список у пам'яті:
+    серверний курсор (yield_per) + буфер на batch_size рядків.
+
+    Синхронний генератор — StreamingResponse ганяє його в threadpool.
+    Сесія своя: Depends(get_db) закривається раніше, ніж почнеться тіло відповіді.
+    """
+    array = fmt == JSON_ARRAY
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        buf = ["["] if array else []
+        first = True
+        for n, row in enumerate(result, start=1):
+            item = json.dumps(serialize(row), ensure_ascii=False, default=_default)
+            if array:
+                buf.append(item if first else "," + item)
+            else:
+                buf.append(item + "\n")
+            first = False
+            if n % batch_size == 0:
+                yield "".join(buf).encode("utf-8")
+                buf = []
+        if array:
+            buf.append("]")
+        if buf:
+            yield "".join(buf).encode("utf-8")
@@ -0,0 +1,195 @@
+# app/services/llm_cache.py
+import hashlib
+import json
+import threading
+from typing import Dict, List, Optional
+
+from ..core.config import settings
+from ..core.redis_cache import get_async_redis, get_redis
+from ..core.ttl_cache import TTLCache
+from .circuit_breaker import breaker_name
+from .llm_port import LLMClient
+
+def _normalize(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    # те саме, що реально піде в модель: порожні репліки LLMService і так пропускає
+    out = []
+    for m in messages:
+        content = (m.get("content") or "").strip()
+        if content:
+            out.append({"role": m.get("role", "user"), "content": content})
+    return out
+
+def cache_key(user_id: int, fingerprint: dict, messages: List[Dict[str, str]]) -> str:
+    raw = json.dumps(
+        {"fp": fingerprint, "messages": _normalize(messages)},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return f"llm:resp:{user_id}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+class ResponseCache:
+    """
+    Кеш готових відповідей LLM: LRU + TTL у пам'яті процесу перед Redis.
+    Ключ уже містить user_id — відповіді одного користувача іншому не віддаються.
+    """
+    def __init__(self, maxsize: int = 1024, ttl_seconds: int = 3600, max_chars: int = 32000):
+        self.ttl_seconds = ttl_seconds
+        self.max_chars = max_chars
+        self._items: "TTLCache[str]" = TTLCache(maxsize, ttl_seconds)
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _get_local(self, key: str) -> Optional[str]:
+        value = self._items.get(key)
+        if value is not None:
+            self._count("local_hits")
+        return value
+
+    def _remote_hit(self, key: str, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            self._items.put(key, value)
+            self._count("redis_hits")
+            return value
+        self._count("misses")
+        return None
+
+    def _accept(self, key: str, value: str) -> bool:
+        if not value or len(value) > self.max_chars:
+            return False
+        self._items.put(key, value)
+        self._count("stores")
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._get_local(key)
+        if value is not None:
+            return value
+        r = get_redis()
+        if r is not None:
+            try:
+                value = r.get(key)
+            except Exception:
+                value = None
+        return self._remote_hit(key, value)
+
+    def put(self, key: str, value: str) -> None:
+        if not self._accept(key, value):
+            return
+        r = get_redis()
+        if r is not None:
+            try:
+                r.setex(key, self.ttl_seconds, value)
+            except Exception:
+                pass
+
+    # async: Redis через redis.asyncio — event loop не блокується
+
+    async def aget(self, key: str) -> Optional[str]:
+        value = self._get_local(key)
+        if value is not None:
+            return value
+        r = get_async_redis()
+        if r is not None:
+            try:
+                value = await r.get(key)
+            except Exception:
+                value = None
+        return self._remote_hit(key, value)
+
+    async def aput(self, key: str, value: str) -> None:
+        if not self._accept(key, value):
+            return
+        r = get_async_redis()
+        if r is not None:
+            try:
+                await r.setex(key, self.ttl_seconds, value)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            st = dict(self._stats)
+        st["size"] = len(self._items)
+        lookups = st["local_hits"] + st["redis_hits"] + st["misses"]
+        st["hit_rate"] = (st["local_hits"] + st["redis_hits"]) / lookups if lookups else 0.0
+        return st
+
+    def clear(self) -> None:
+        self._items.clear()
+
+response_cache = ResponseCache(
+    maxsize=settings.LLM_RESPONSE_CACHE_SIZE,
+    ttl_seconds=settings.LLM_RESPONSE_CACHE_TTL_SECONDS,
+    max_chars=settings.LLM_RESPONSE_CACHE_MAX_CHARS,
+)
+
+class CachingDecorator(LLMClient):
+    """
+    Обгортка над LLMClient: відповідь з temperature == 0 детермінована,
+    тож повторний такий самий запит того ж користувача віддаємо з кешу.
+    Стрім кешується лише повністю дочитаний; з кешу він приходить одним чанком.
+    """
+    def __init__(self, client: LLMClient, user_id: int, cache: ResponseCache | None = None):
+        self.client = client
+        self.user_id = user_id
+        self.cache = cache or response_cache
+        self.model = breaker_name(client)
+
+    def fingerprint(self, **kw) -> Optional[dict]:
+        return self.client.fingerprint(**kw)
+
+    def _key(self, messages: List[Dict[str, str]], **kw) -> Optional[str]:
+        fp = self.client.fingerprint(**kw)
+        if fp is None or fp.get("generation_config", {}).get("temperature") != 0:
+            return None
+        return cache_key(self.user_id, fp, messages)
+
+    def generate(self, prompt: str, **kw):
+        key = self._key([{"role": "user", "content": prompt}], **kw)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        text = self.client.generate(prompt, **kw)
+        if key:
+            self.cache.put(key, text)
+        return text
+
+    def chat_stream(self, messages, **kw):
+        key = self._key(messages, **kw)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        for chunk in self.client.chat_stream(messages, **kw):
+            parts.append(chunk)
+            yield chunk
+        if key:
+            self.cache.put(key, "".join(parts))
+
+    async def agenerate(self, prompt: str, **kw):
+        key = self._key([{"role": "user", "content": prompt}], **kw)
+        cached = await self.cache.aget(key) if key else None
+        if cached is not None:
+            return cached
+        text = await self.client.agenerate(prompt, **kw)
+        if key:
+            await self.cache.aput(key, text)
+        return text
+
+    async def achat_stream(self, messages, **kw):
+        key = self._key(messages, **kw)
+        cached = await self.cache.aget(key) if key else None
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        async for chunk in self.client.achat_stream(messages, **kw):
+            parts.append(chunk)
+            yield chunk
+        if key:
+            await self.cache.aput(key, "".join(parts))
@@ -0,0 +1,63 @@
+# app/services/llm_client_cache.py
+import threading
+from typing import Any, Hashable, Optional
+
+from ..core.config import settings
+from ..core.redis_cache import get_redis
+from ..core.ttl_cache import TTLCache
+
+def _version_key(user_id: int) -> str:
+    return f"user:{user_id}:llm_client_version"
+
+class LLMClientCache:
+    """
+    Process-wide LRU + TTL cache of ready-to-use LLM client stacks.
+
+    Key = (user_id, settings version, ...). The version is bumped by
+    invalidate_user() (update_settings / set_api_key), so stale stacks
+    are never returned. With Redis the version is shared across workers,
+    otherwise it is per-process and TTL bounds the staleness.
+    """
+    def __init__(self, maxsize: int = 256, ttl_seconds: float = 300):
+        self._items: "TTLCache[Any]" = TTLCache(maxsize, ttl_seconds)
+        self._local_versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    # --------- versions ---------
+    def version(self, user_id: int) -> int:
+        r = get_redis()
+        if r is not None:
+            try:
+                return int(r.get(_version_key(user_id)) or 0)
+            except Exception:
+                pass
+        return self._local_versions.get(user_id, 0)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._local_versions[user_id] = self._local_versions.get(user_id, 0) + 1
+        self._items.pop_where(lambda key: key[0] == user_id)
+        r = get_redis()
+        if r is not None:
+            try:
+                r.incr(_version_key(user_id))
+            except Exception:
+                pass
+
+    # --------- items ---------
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self._items.get(key)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._items.put(key, value)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+client_cache = LLMClientCache(
+    maxsize=settings.LLM_CLIENT_CACHE_SIZE,
+    ttl_seconds=settings.LLM_CLIENT_CACHE_TTL_SECONDS,
+)
+
+def invalidate_llm_client(user_id: int) -> None:
+    client_cache.invalidate_user(user_id)
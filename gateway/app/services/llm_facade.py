@@ -1,10 +1,16 @@
 # app/services/llm_facade.py
+import hashlib
+import json
+from typing import Awaitable, Callable
 from sqlalchemy.orm import Session
 from .llm_port import LLMClient
 from .gemini_adapter import GeminiAdapter
 from .retry_decorator import RetryDecorator
 from .llm_router import LLMRouter
-from .llm_factory import make_llm
+from .llm_cache import CachingDecorator
+from .single_flight import single_flight
+from ..core.config import settings
+from .llm_factory import get_llm
 
 # Якщо хочеш fallback, коли буде OpenAIAdapter:
 # from .openai_adapter import OpenAIAdapter
@@ -16,7 +22,7 @@ class LLMFacade:
                  retries: int = 2,
                  delay: float = 1.0):
 
-        base_client: LLMClient = client or make_llm(
+        base_client: LLMClient = client or get_llm(
             db = db,
             user_id= user_id,
             user_router= use_router
@@ -28,10 +34,73 @@ class LLMFacade:
             delay=delay
         )
 
+        # кеш зовні ретраїв: влучання не витрачає retry budget і не чіпає брейкери
+        if settings.LLM_RESPONSE_CACHE_ENABLED:
+            retry_client = CachingDecorator(retry_client, user_id)
+
         self.client = retry_client
+        self.user_id = user_id
+
+    @property
+    def model(self) -> str | None:
+        # модель, на яку піде запит (для бюджету контексту тощо)
+        return getattr(self.client, "model", None)
+
+    def _flight_key(self, messages, chat_id, kw, finished: bool = False) -> str:
+        raw = json.dumps(
+            {
+                "user": self.user_id,
+                "chat": chat_id,
+                "finished": finished,
+                "model": kw.get("model") or self.model,
+                "settings": kw.get("settings") or kw.get("settings_dict"),
+                "messages": messages,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return "llm:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
-    def complete(self, messages, **kw) -> str:
-        return next(self.client.chat_stream(messages, **kw))
+    # LLMUnavailableError (всі моделі/ретраї вичерпано) прокидається до викликача:
+    # це не відповідь моделі — роут віддає 503 / SSE error, Telegram — UNAVAILABLE_REPLY,
+    # і в історію чату вона не потрапляє.
+    # однакові одночасні complete/acomplete (подвійний клік, повторна доставка апдейту)
+    # отримують результат одного спільного виклику — див. single_flight
+
+    def complete(self, messages, *, chat_id: int | None = None, **kw) -> str:
+        # chat_stream тепер віддає кілька чанків — склеюємо повну відповідь
+        def call() -> str:
+            return "".join(self.client.chat_stream(messages, **kw))
+        if not settings.LLM_SINGLE_FLIGHT_ENABLED:
+            return call()
+        return single_flight.do(self._flight_key(messages, chat_id, kw), call)
 
     def complete_stream(self, messages, **kw):
-        return self.client.chat_stream(messages, **kw)
+        yield from self.client.chat_stream(messages, **kw)
+
+    async def acomplete(
+        self,
+        messages,
+        *,
+        chat_id: int | None = None,
+        finish: Callable[[str], Awaitable[str]] | None = None,
+        **kw,
+    ) -> str:
+        """
+        finish — крок над готовою відповіддю (напр. збереження в чат), який виконує
+        лише лідер single-flight; усі об'єднані запити отримують його результат
+        (а не N разів повторюють побічний ефект). Якщо відповіді немає
+        (LLMUnavailableError), finish не викликається.
+        """
+        async def call() -> str:
+            text = "".join([chunk async for chunk in self.client.achat_stream(messages, **kw)])
+            return await finish(text) if finish is not None else text
+        if not settings.LLM_SINGLE_FLIGHT_ENABLED:
+            return await call()
+        key = self._flight_key(messages, chat_id, kw, finished=finish is not None)
+        return await single_flight.ado(key, call)
+
+    async def acomplete_stream(self, messages, **kw):
+        async for chunk in self.client.achat_stream(messages, **kw):
+            yield chunk
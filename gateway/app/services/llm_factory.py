@@ -4,6 +4,7 @@ from .gemini_adapter import GeminiAdapter
 from .llm_router import LLMRouter
 from .llm_port import LLMClient
 from .llm_settings import get_or_create_settings
+from .llm_client_cache import client_cache
 
 def make_llm(db: Session, user_id:int, *, user_router: bool = False) -> LLMClient:
     """
@@ -25,3 +26,16 @@ def make_llm(db: Session, user_id:int, *, user_router: bool = False) -> LLMClien
         fb = GeminiAdapter(db, user_id, "gemini-2.5-flash")
         return LLMRouter(primary, fb)
     return primary
+
+
+def get_llm(db: Session, user_id: int, *, user_router: bool = False) -> LLMClient:
+    """
+    Те саме, що make_llm, але через process-wide кеш:
+    без запитів до БД, розшифрування ключа та genai.configure на кожне повідомлення.
+    """
+    key = (user_id, client_cache.version(user_id), user_router)
+    client = client_cache.get(key)
+    if client is None:
+        client = make_llm(db, user_id, user_router=user_router)
+        client_cache.put(key, client)
+    return client
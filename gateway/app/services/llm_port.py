@@ -1,9 +1,20 @@
 # app/services/llm_port.py — уніфікований інтерфейс
 from abc import ABC, abstractmethod
-from typing import Iterable, Dict, Any, List
+from typing import Iterable, AsyncIterator, Dict, Any, List, Optional
 
 class LLMClient(ABC):
     @abstractmethod
     def generate(self, prompt: str, **kw) -> str: ...
     @abstractmethod
     def chat_stream(self, messages: List[Dict[str,str]], **kw) -> Iterable[str]: ...
+
+    # async-варіанти: для async-роутів, щоб очікування LLM не тримало потік threadpool
+    @abstractmethod
+    async def agenerate(self, prompt: str, **kw) -> str: ...
+    @abstractmethod
+    def achat_stream(self, messages: List[Dict[str,str]], **kw) -> AsyncIterator[str]: ...
+
+    # що визначає відповідь (provider, model, generation config) — для кешу відповідей;
+    # None — клієнт не знає, тож кешувати не можна. Обгортки делегують внутрішньому клієнту.
+    def fingerprint(self, **kw) -> Optional[Dict[str, Any]]:
+        return None
@@ -1,5 +1,6 @@
 # app/services/llm_router.py
 from .llm_port import LLMClient
+from .circuit_breaker import breakers, breaker_name
 
 class LLMRouter(LLMClient):
     """
@@ -8,8 +9,31 @@ class LLMRouter(LLMClient):
     def __init__(self, primary: LLMClient, fallback: LLMClient | None = None):
         self.primary = primary
         self.fallback = fallback
+        # RetryDecorator над роутером дивиться на брейкер primary-моделі
+        self.model = breaker_name(primary)
+
+    def fingerprint(self, **kw):
+        # кешуємо лише за primary: відповідь fallback-провайдера теж валідна для цього запиту
+        return self.primary.fingerprint(**kw)
+
+    def _skip_primary(self) -> bool:
+        # брейкер primary відкритий — одразу йдемо у fallback, не чекаючи таймауту
+        return (
+            self.fallback is not None
+            and self.model is not None
+            and not breakers.available(self.model)
+        )
+
+    async def _askip_primary(self) -> bool:
+        return (
+            self.fallback is not None
+            and self.model is not None
+            and not await breakers.aavailable(self.model)
+        )
 
     def generate(self, prompt: str, **kw):
+        if self._skip_primary():
+            return self.fallback.generate(prompt, **kw)
         try:
             return self.primary.generate(prompt, **kw)
         except Exception as e:
@@ -20,11 +44,48 @@ class LLMRouter(LLMClient):
             return self.fallback.generate(prompt, **kw)
 
     def chat_stream(self, messages, **kw):
+        if self._skip_primary():
+            yield from self.fallback.chat_stream(messages, **kw)
+            return
+        emitted = False
         try:
-            yield from self.primary.chat_stream(messages, **kw)
+            for chunk in self.primary.chat_stream(messages, **kw):
+                emitted = True
+                yield chunk
         except Exception as e:
             print(f"[LLMRouter] Primary failed: {e}")
-            if not self.fallback:
+            # після частково відданої відповіді fallback продублював би текст
+            if not self.fallback or emitted:
                 raise
             print("[LLMRouter] Switching to fallback provider…")
             yield from self.fallback.chat_stream(messages, **kw)
+
+    async def agenerate(self, prompt: str, **kw):
+        if await self._askip_primary():
+            return await self.fallback.agenerate(prompt, **kw)
+        try:
+            return await self.primary.agenerate(prompt, **kw)
+        except Exception as e:
+            print(f"[LLMRouter] Primary failed: {e}")
+            if not self.fallback:
+                raise
+            print("[LLMRouter] Switching to fallback provider…")
+            return await self.fallback.agenerate(prompt, **kw)
+
+    async def achat_stream(self, messages, **kw):
+        if await self._askip_primary():
+            async for chunk in self.fallback.achat_stream(messages, **kw):
+                yield chunk
+            return
+        emitted = False
+        try:
+            async for chunk in self.primary.achat_stream(messages, **kw):
+                emitted = True
+                yield chunk
+        except Exception as e:
+            print(f"[LLMRouter] Primary failed: {e}")
+            if not self.fallback or emitted:
+                raise
+            print("[LLMRouter] Switching to fallback provider…")
+            async for chunk in self.fallback.achat_stream(messages, **kw):
+                yield chunk
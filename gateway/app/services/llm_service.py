@@ -1,24 +1,53 @@
-import google.generativeai as genai
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Iterator, AsyncIterator, Tuple
+from .circuit_breaker import breakers
+from .gemini_client import GeminiClient
+from .retry_policy import LLMUnavailableError, RetryPolicy
 from .llm_settings import get_or_create_settings, get_api_key
 from sqlalchemy.orm import Session
 
+UNAVAILABLE_REPLY = "⚠️ Gemini не доступний зараз, спробуйте пізніше."
+
+def _unavailable(last_error: Optional[Exception]) -> LLMUnavailableError:
+    # остання помилка йде в __cause__ — RetryPolicy класифікує саме її
+    err = LLMUnavailableError("All Gemini models failed")
+    err.__cause__ = last_error
+    return err
+
+def _chunk_text(chunk) -> str:
+    # chunk.text кидає ValueError, якщо в чанку немає parts (safety-блок, finish_reason)
+    try:
+        return chunk.text or ""
+    except ValueError:
+        return ""
+
+def _model_failure(e: Exception) -> bool:
+    """
+    Чи це збій моделі (таймаут, 429, 5xx), а не помилка цього користувача.
+    Брейкери спільні для всіх користувачів, тож невалідний ключ чи запит
+    (PermissionDenied, InvalidArgument) не повинен відкривати модель для інших —
+    такі помилки прокидаємо одразу, брейкер не чіпаємо.
+    """
+    return RetryPolicy.is_retriable(e)
+
 class LLMService:
+    """
+    Інстанс живе в кеші клієнтів (llm_client_cache) довше за запит,
+    тому тримаємо знімок налаштувань, а не ORM-об'єкт і не Session.
+    """
     def __init__(self, db: Session, user_id: int):
-        self.db = db
         self.user_id = user_id
-        self.llm_settings = get_or_create_settings(db, user_id)
+        llm_settings = get_or_create_settings(db, user_id)
+        self.temperature = llm_settings.temperature
+        self.max_tokens = llm_settings.max_tokens
+        self.default_model = llm_settings.default_model
         api_key = get_api_key(db, user_id, "gemini")
         if not api_key:
             raise RuntimeError("Gemini API key is not configured for this user.")
-        genai.configure(api_key=api_key)
+        # свій клієнт з ключем цього користувача — без глобального genai.configure
+        self.client = GeminiClient(api_key)
 
-    def complete(
-        self,
-        messages: List[Dict[str, str]],
-        model: Optional[str] = None,
-        settings_dict: Optional[dict] = None,
-    ) -> str:
+    def _history(self, messages: List[Dict[str, str]]) -> list:
         # ---- побудова історії
         history = []
         for m in messages:
@@ -30,35 +59,184 @@ class LLMService:
                 history.append({"role": "model", "parts": [content]})
             else:
                 history.append({"role": "user", "parts": [content]})
+        return history
 
-        base_temp = self.llm_settings.temperature or 0.7
-        base_max_tokens = self.llm_settings.max_tokens or 1024
+    def _generation_config(self, settings_dict: Optional[dict]) -> dict:
+        # temperature == 0 — валідне значення (детермінована відповідь), не підміняємо його
+        base_temp = 0.7 if self.temperature is None else self.temperature
+        base_max_tokens = self.max_tokens or 1024
 
         # ---- конфіг генерації
-        generation_config = {
+        return {
             "temperature": (settings_dict or {}).get("temperature", base_temp),
             "top_p": (settings_dict or {}).get("top_p", 0.95),
             "max_output_tokens": (settings_dict or {}).get("max_tokens", base_max_tokens),
         }
 
-        default_model = self.llm_settings.default_model or "gemini-2.5-pro"
+    def _model_names(self, model: Optional[str]) -> List[str]:
+        default_model = self.default_model or "gemini-2.5-pro"
         main_model = model or default_model
+        return [main_model or "gemini-2.5-pro", "gemini-2.5-flash", "gemini-2.5-flash-lite"]
+
+    def _candidates(self, model: Optional[str]) -> List[Tuple[str, str]]:
+        # ---- список моделей для спроб (основна → запасні) зі станом брейкера;
+        # моделі з відкритим брейкером відкидаються, запасні — за health score
+        return breakers.order(self._model_names(model))
+
+    async def _acandidates(self, model: Optional[str]) -> List[Tuple[str, str]]:
+        return await breakers.aorder(self._model_names(model))
 
-        # ---- список моделей для спроб (основна → запасні)
-        candidates = [main_model or "gemini-2.5-pro", "gemini-2.5-flash", "gemini-2.5-flash-lite"]
+    def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        settings_dict: Optional[dict] = None,
+    ) -> str:
+        history = self._history(messages)
+        generation_config = self._generation_config(settings_dict)
 
-        for name in candidates:
+        last_error: Optional[Exception] = None
+        for name, state in self._candidates(model):
+            if not breakers.acquire(name, state):
+                continue
+            started_at = time.monotonic()
             try:
                 print(f"[LLMService] trying model: {name}")
-                llm = genai.GenerativeModel(name, generation_config=generation_config)
+                llm = self.client.model(name, generation_config)
                 chat = llm.start_chat(history=history)
                 resp = chat.send_message(" ")  # тригер відповіді
-                text = (resp.text or "").strip()
+                breakers.record_success(name, time.monotonic() - started_at)
+                text = _chunk_text(resp).strip()
                 if text:
                     print(f"[LLMService] success with model: {name}")
                     return text
             except Exception as e:
+                if not _model_failure(e):
+                    raise
+                breakers.record_failure(name, time.monotonic() - started_at)
+                last_error = e
+                print(f"[LLMService] model {name} failed → {e}")
+
+        # ---- якщо всі спроби не вдалися (або всі брейкери відкриті)
+        raise _unavailable(last_error)
+
+    def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        settings_dict: Optional[dict] = None,
+    ) -> Iterator[str]:
+        """
+        Інкрементальна відповідь: віддає текстові чанки, щойно Gemini їх генерує.
+        Fallback на наступну модель можливий лише доки клієнту ще нічого не віддано.
+        """
+        history = self._history(messages)
+        generation_config = self._generation_config(settings_dict)
+
+        last_error: Optional[Exception] = None
+        for name, state in self._candidates(model):
+            if not breakers.acquire(name, state):
+                continue
+            started = False
+            started_at = time.monotonic()
+            try:
+                print(f"[LLMService] streaming from model: {name}")
+                llm = self.client.model(name, generation_config)
+                chat = llm.start_chat(history=history)
+                resp = chat.send_message(" ", stream=True)
+                for chunk in resp:
+                    text = _chunk_text(chunk)
+                    if text:
+                        started = True
+                        yield text
+                breakers.record_success(name, time.monotonic() - started_at)
+                if started:
+                    print(f"[LLMService] stream finished with model: {name}")
+                    return
+            except Exception as e:
+                if not _model_failure(e):
+                    raise
+                breakers.record_failure(name, time.monotonic() - started_at)
+                if started:
+                    # частину відповіді вже віддано — перемикати модель посеред тексту не можна
+                    raise
+                last_error = e
                 print(f"[LLMService] model {name} failed → {e}")
 
         # ---- якщо всі спроби не вдалися
-        return "⚠️ Gemini не доступний зараз, спробуйте пізніше."
+        raise _unavailable(last_error)
+
+    # ---------------- async-варіанти (не займають потоки threadpool) ----------------
+
+    async def acomplete(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        settings_dict: Optional[dict] = None,
+    ) -> str:
+        history = self._history(messages)
+        generation_config = self._generation_config(settings_dict)
+
+        last_error: Optional[Exception] = None
+        for name, state in await self._acandidates(model):
+            if not await breakers.aacquire(name, state):
+                continue
+            started_at = time.monotonic()
+            try:
+                print(f"[LLMService] trying model (async): {name}")
+                llm = self.client.model(name, generation_config, is_async=True)
+                chat = llm.start_chat(history=history)
+                resp = await chat.send_message_async(" ")  # тригер відповіді
+                await breakers.arecord_success(name, time.monotonic() - started_at)
+                text = _chunk_text(resp).strip()
+                if text:
+                    print(f"[LLMService] success with model: {name}")
+                    return text
+            except Exception as e:
+                if not _model_failure(e):
+                    raise
+                await breakers.arecord_failure(name, time.monotonic() - started_at)
+                last_error = e
+                print(f"[LLMService] model {name} failed → {e}")
+
+        raise _unavailable(last_error)
+
+    async def achat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        settings_dict: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        history = self._history(messages)
+        generation_config = self._generation_config(settings_dict)
+
+        last_error: Optional[Exception] = None
+        for name, state in await self._acandidates(model):
+            if not await breakers.aacquire(name, state):
+                continue
+            started = False
+            started_at = time.monotonic()
+            try:
+                print(f"[LLMService] streaming from model (async): {name}")
+                llm = self.client.model(name, generation_config, is_async=True)
+                chat = llm.start_chat(history=history)
+                resp = await chat.send_message_async(" ", stream=True)
+                async for chunk in resp:
+                    text = _chunk_text(chunk)
+                    if text:
+                        started = True
+                        yield text
+                await breakers.arecord_success(name, time.monotonic() - started_at)
+                if started:
+                    print(f"[LLMService] stream finished with model: {name}")
+                    return
+            except Exception as e:
+                if not _model_failure(e):
+                    raise
+                await breakers.arecord_failure(name, time.monotonic() - started_at)
+                if started:
+                    raise
+                last_error = e
+                print(f"[LLMService] model {name} failed → {e}")
+
+        raise _unavailable(last_error)
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 
 from ..models.llm_settings import LlmSettings
 from ..models.llm_credentials import LlmApiCredential
-from ..core.encryption import encrypt_api_key, decrypt_api_key
+from ..core.encryption import encrypt_api_key, decrypt_api_key_cached
+from .llm_client_cache import invalidate_llm_client
 
 # --------- Settings ---------
 def get_or_create_settings(db: Session, user_id: int) -> LlmSettings:
@@ -56,6 +57,7 @@ def update_settings(
 
     db.commit()
     db.refresh(settings)
+    invalidate_llm_client(user_id)
     return settings
 
 
@@ -88,6 +90,7 @@ def set_api_key(db: Session, user_id: int, provider:str, api_key: str) -> LlmApi
 
     db.commit()
     db.refresh(cred)
+    invalidate_llm_client(user_id)
     return cred
 
 def get_api_key(db: Session, user_id: int, provider: str) -> Optional[str]:
@@ -106,7 +109,7 @@ def get_api_key(db: Session, user_id: int, provider: str) -> Optional[str]:
     )
     if cred is None:
         return None
-    return decrypt_api_key(cred.encrypted_api_key)
+    return decrypt_api_key_cached(cred.id, cred.encrypted_api_key)
 
 def has_api_key(db: Session, user_id: int, provider: str) -> bool:
     """
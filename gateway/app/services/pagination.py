@@ -0,0 +1,101 @@
+# app/services/pagination.py
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+class InvalidCursor(ValueError):
+    """Курсор пошкоджений або не з цього API."""
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+def _apply_keyset(q, created_col, id_col, before: Optional[str], after: Optional[str]):
+    """Фільтр + сортування для сторінки; працює і з Query, і з select()."""
+    if before and after:
+        raise InvalidCursor("Use either 'before' or 'after', not both")
+
+    if after:
+        created_at, row_id = decode_cursor(after)
+        q = q.filter(or_(
+            created_col > created_at,
+            and_(created_col == created_at, id_col > row_id),
+        )).order_by(created_col.asc(), id_col.asc())
+        return q, True
+
+    if before:
+        created_at, row_id = decode_cursor(before)
+        q = q.filter(or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_col < row_id),
+        ))
+    return q.order_by(created_col.desc(), id_col.desc()), False
+
+def _finish_page(rows: List[Any], limit: Optional[int], ascending: bool, newest_first: bool):
+    rows = list(rows)
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    if ascending == newest_first:
+        rows.reverse()
+    return rows, next_cursor
+
+def keyset_page(
+    q: Query,
+    created_col,
+    id_col,
+    *,
+    limit: Optional[int],
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    newest_first: bool,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Keyset-пагінація по (created_at, id) — без OFFSET, кожна сторінка йде по індексу.
+
+    - без курсора: найсвіжіші `limit` записів
+    - before=<cursor>: старіші за курсор (гортаємо назад)
+    - after=<cursor>: новіші за курсор (гортаємо вперед)
+    - limit=None: усі записи (у тому ж порядку), без next_cursor
+
+    Порядок у відповіді — newest_first або хронологічний, незалежно від напрямку.
+    Повертає (rows, next_cursor); next_cursor — продовження в тому ж напрямку
+    або None, якщо далі нічого немає.
+    """
+    q, ascending = _apply_keyset(q, created_col, id_col, before, after)
+    if limit is not None:
+        q = q.limit(limit + 1)
+    return _finish_page(q.all(), limit, ascending, newest_first)
+
+async def akeyset_page(
+    db: AsyncSession,
+    stmt: Select,
+    created_col,
+    id_col,
+    *,
+    limit: Optional[int],
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    newest_first: bool,
+) -> Tuple[List[Any], Optional[str]]:
+    """keyset_page для AsyncSession: stmt — select() по ORM-сутності."""
+    stmt, ascending = _apply_keyset(stmt, created_col, id_col, before, after)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    rows = (await db.execute(stmt)).scalars().all()
+    return _finish_page(rows, limit, ascending, newest_first)
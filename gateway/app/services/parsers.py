@@ -1,14 +1,18 @@
 # app/services/parsers.py
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, Iterator, Optional
 import os, subprocess, tempfile
-from ..services.parsers_pdf import parse_pdf
+from ..services.parsers_pdf import parse_pdf, ProgressFn
 from ..services.parsers_docx import parse_docx
 
-def parse_any(path: str, mime: str) -> Tuple[Dict, List[Dict]]:
+# Протокол парсеров: (meta, генератор чанков {seq, text, page_from, page_to}).
+# meta известна сразу, чанки отдаются по мере извлечения — документ целиком в памяти не держим.
+ParsedDocument = Tuple[Dict, Iterator[Dict]]
+
+def parse_any(path: str, mime: str, on_progress: Optional[ProgressFn] = None) -> ParsedDocument:
     ext = os.path.splitext(path)[1].lower()
 
     if mime == "application/pdf" or ext == ".pdf":
-        return parse_pdf(path)
+        return parse_pdf(path, on_progress=on_progress)
 
     if mime in (
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
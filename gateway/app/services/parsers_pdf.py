@@ -1,9 +1,65 @@
 # app/services/parsers_pdf.py
-from typing import Tuple, Dict, List
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Tuple, Dict, Iterator, List, Optional
 import pdfplumber
 
-def parse_pdf(path: str) -> Tuple[Dict, List[Dict]]:
-    chunks: List[Dict] = []
+from ..core.config import settings
+
+ProgressFn = Callable[[int, int], None]  # (оброблено сторінок, всього сторінок)
+
+def _extract_range(path: str, start: int, end: int) -> List[str]:
+    """Текст сторінок [start, end) — виконується у процесі пулу, кожен відкриває PDF сам."""
+    with pdfplumber.open(path) as pdf:
+        return [(page.extract_text() or "") for page in pdf.pages[start:end]]
+
+def _page_ranges(page_count: int, batch: int) -> List[Tuple[int, int]]:
+    batch = max(1, batch)
+    return [(s, min(s + batch, page_count)) for s in range(0, page_count, batch)]
+
+def _iter_ranges(path: str, ranges: List[Tuple[int, int]], workers: int) -> Iterator[Tuple[int, List[str]]]:
+    """(start, texts) по порядку діапазонів."""
+    if workers <= 1:
+        for start, end in ranges:
+            yield start, _extract_range(path, start, end)
+        return
+
+    # CPU-bound pdfplumber → діапазони сторінок у пулі процесів (spawn: воркер dramatiq багатопотоковий).
+    # У роботі не більше workers*2 діапазонів — пам'ять не росте з розміром документа
+    todo = iter(ranges)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque((start, pool.submit(_extract_range, path, start, end))
+                        for start, end in islice(todo, workers * 2))
+        while pending:
+            start, fut = pending.popleft()
+            texts = fut.result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append((nxt[0], pool.submit(_extract_range, path, *nxt)))
+            yield start, texts
+
+def _iter_chunks(path: str, page_count: int, on_progress: Optional[ProgressFn]) -> Iterator[Dict]:
+    ranges = _page_ranges(page_count, settings.PDF_PAGES_PER_BATCH)
+    workers = min(settings.PDF_PARSE_WORKERS, os.cpu_count() or 1, len(ranges))
+
+    seq = 0
+    for start, texts in _iter_ranges(path, ranges, workers):
+        # чанкуем по страницам; можно далее резать по N символов
+        for i, text in enumerate(texts, start=start + 1):
+            if text.strip():
+                yield {"seq": seq, "text": text, "page_from": i, "page_to": i}
+                seq += 1
+        if on_progress:
+            on_progress(start + len(texts), page_count)
+
+def parse_pdf(path: str, on_progress: Optional[ProgressFn] = None) -> Tuple[Dict, Iterator[Dict]]:
+    """
+    meta — одразу, чанки — генератором у міру вилучення сторінок
+    (у пам'яті лише діапазони, що зараз в роботі).
+    """
     meta: Dict = {}
 
     with pdfplumber.open(path) as pdf:
@@ -13,12 +69,4 @@ def parse_pdf(path: str) -> Tuple[Dict, List[Dict]]:
         meta["title"] = doc_meta.get("Title")
         meta["author"] = doc_meta.get("Author")
 
-        seq = 0
-        for i, page in enumerate(pdf.pages, start=1):
-            text = page.extract_text() or ""
-            # чанкуем по страницам; можно далее резать по N символов
-            if text.strip():
-                chunks.append({"seq": seq, "text": text, "page_from": i, "page_to": i})
-                seq += 1
-
-    return meta, chunks
+    return meta, _iter_chunks(path, meta["page_count"], on_progress)
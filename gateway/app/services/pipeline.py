@@ -1,5 +1,7 @@
 import logging
+from sqlalchemy import delete, insert, literal, select
 from sqlalchemy.orm import Session
+from ..core.config import settings
 from ..db.session import SessionLocal
 from ..models.document import Document, DocumentStatus, DocumentChunk
 from ..services.parsers import parse_any
@@ -12,6 +14,53 @@ def _update(doc: Document, db: Session, *, status=None, progress=None, processed
     if processed_by is not None: doc.processed_by = processed_by
     db.commit()
 
+def _insert_chunks(db: Session, rows: list[dict]) -> None:
+    # Core insert без unit of work: без ORM-объектов и identity map на каждый чанк
+    db.execute(insert(DocumentChunk), rows)
+    db.commit()
+
+def reuse_parsed_document(db: Session, doc: Document) -> bool:
+    """
+    Дедупликация по sha256: если такой же файл этого же владельца уже разобран
+    (status=ready), копируем его метаданные и чанки одним INSERT ... SELECT вместо
+    повторного парсинга. Документы других пользователей не используются и не
+    упоминаются (id источника не сохраняется). Коммит — на вызывающей стороне.
+    """
+    src = db.scalars(
+        select(Document)
+        .where(
+            Document.user_id == doc.user_id,
+            Document.sha256 == doc.sha256,
+            Document.status == DocumentStatus.ready.value,
+            Document.id != doc.id,
+        )
+        .order_by(Document.id)
+        .limit(1)
+    ).first()
+    if src is None:
+        return False
+
+    db.execute(
+        insert(DocumentChunk).from_select(
+            ["document_id", "seq", "text", "page_from", "page_to"],
+            select(
+                literal(doc.id),
+                DocumentChunk.seq,
+                DocumentChunk.text,
+                DocumentChunk.page_from,
+                DocumentChunk.page_to,
+            ).where(DocumentChunk.document_id == src.id),
+        )
+    )
+    doc.page_count = src.page_count
+    doc.title = src.title
+    doc.author = src.author
+    doc.language = src.language
+    doc.processed_by = "dedup"
+    doc.status = DocumentStatus.ready.value
+    doc.progress_percent = 100
+    return True
+
 def process_document(document_id: int) -> None:
     db: Session = SessionLocal()
     try:
@@ -22,24 +71,46 @@ def process_document(document_id: int) -> None:
         if doc.status in (DocumentStatus.processing.value, DocumentStatus.ready.value):
             return
 
+        # тот же файл мог дообработаться, пока этот ждал в очереди
+        if reuse_parsed_document(db, doc):
+            db.commit()
+            log.info("doc %s: ready (reused parsed chunks)", document_id)
+            return
+
         log.info("doc %s: start", document_id)
         _update(doc, db, status=DocumentStatus.processing.value, progress=0, processed_by="pipeline@1.0")
 
-        meta, chunks = parse_any(doc.path, doc.mime)
+        # повтор после сбоя: чанки прошлой попытки могли быть уже закоммичены
+        db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == doc.id))
+
+        # парсинг и запись идут вместе: прогресс 0..99% по страницам, 100% — ready
+        def on_progress(done: int, total: int) -> None:
+            _update(doc, db, progress=99 * done // max(total, 1))
+
+        meta, chunks = parse_any(doc.path, doc.mime, on_progress=on_progress)
         doc.page_count = meta.get("page_count")
         doc.title = meta.get("title")
         doc.author = meta.get("author")
         doc.language = meta.get("language")
-        _update(doc, db, progress=80)
+        db.commit()
 
+        # чанки приходят генератором — пишем пачками (один executemany INSERT + коммит на пачку):
+        # память воркера ограничена, а уже готовые чанки клиенты видят до конца разбора
+        batch: list[dict] = []
         for i, ch in enumerate(chunks):
-            db.add(DocumentChunk(
-                document_id=doc.id,
-                seq=ch.get("seq", i),
-                text=ch["text"],
-                page_from=ch.get("page_from"),
-                page_to=ch.get("page_to"),
-            ))
+            batch.append({
+                "document_id": doc.id,
+                "seq": ch.get("seq", i),
+                "text": ch["text"],
+                "page_from": ch.get("page_from"),
+                "page_to": ch.get("page_to"),
+            })
+            if len(batch) >= settings.DOCUMENT_CHUNK_BATCH_SIZE:
+                _insert_chunks(db, batch)
+                batch = []
+        if batch:
+            _insert_chunks(db, batch)
+
         doc.status = DocumentStatus.ready.value
         doc.progress_percent = 100
         db.commit()
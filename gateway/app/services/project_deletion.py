@@ -0,0 +1,153 @@
+# app/services/project_deletion.py
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import delete, exists, literal, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.chat import Chat, Message, Project
+from ..models.telegram_account import TelegramAccount
+from .chat_ownership import invalidate_chat_owner
+
+"""
+Видалення проектів set-based запитами (UPDATE/DELETE ... WHERE), без завантаження
+чатів і db.delete() по одному. Повідомлення та summaries чатів видаляє БД
+каскадом (FK ON DELETE CASCADE), project_id чатів у кошику обнуляє FK ON DELETE SET NULL.
+"""
+
+def _project_chats(project_id: int):
+    return select(Chat.id).where(Chat.project_id == project_id)
+
+def _project_chat_ids(db: Session, project_id: int) -> List[int]:
+    return list(db.scalars(_project_chats(project_id)))
+
+def not_purging():
+    """
+    Фільтр для запитів по Chat: чати проекту, що чекає фонового purge
+    (projects.deleted_at), не показуються ні в списках, ні в кошику, і їх не можна відновити.
+    """
+    return ~exists().where(Project.id == Chat.project_id, Project.deleted_at.is_not(None))
+
+def _detach_telegram(db: Session, project_id: int, with_chats: bool = False) -> None:
+    # telegram_accounts посилаються на chats/projects без ON DELETE — знімаємо посилання
+    db.execute(
+        update(TelegramAccount)
+        .where(TelegramAccount.active_project_id == project_id)
+        .values(active_project_id=None)
+    )
+    if with_chats:
+        # підзапит, а не IN (<список id>): без ліміту SQLite на кількість параметрів
+        db.execute(
+            update(TelegramAccount)
+            .where(TelegramAccount.active_chat_id.in_(_project_chats(project_id)))
+            .values(active_chat_id=None)
+        )
+
+def trash_project(db: Session, project_id: int) -> None:
+    """Чати проекту → кошик (deleted_at), сам проект видаляється."""
+    chat_ids = _project_chat_ids(db, project_id)
+    db.execute(
+        update(Chat)
+        .where(Chat.project_id == project_id, Chat.deleted_at.is_(None))
+        .values(deleted_at=datetime.utcnow())
+    )
+    _detach_telegram(db, project_id)
+    db.execute(delete(Project).where(Project.id == project_id))
+    db.commit()
+    invalidate_chat_owner(*chat_ids)
+
+def _project_has_more_messages(db: Session, project_id: int, threshold: int) -> bool:
+    # проба LIMIT 1 OFFSET threshold замість повного COUNT: читаємо не більше threshold+1 рядків індексу
+    return db.scalar(
+        select(literal(1))
+        .where(Message.chat_id.in_(_project_chats(project_id)))
+        .offset(threshold)
+        .limit(1)
+    ) is not None
+
+def delete_project_hard(db: Session, project_id: int) -> bool:
+    """
+    Жорстке видалення проекту з усіма чатами.
+    Великий проект (> PROJECT_PURGE_ASYNC_MESSAGES повідомлень) лише позначається
+    projects.deleted_at і зникає зі списків і кошика (not_purging), а дані видаляє
+    purge_project_async у воркері. Якщо поставити задачу не вдалося — видаляємо тут же.
+    Повертає True, якщо видалення пішло у фон.
+    """
+    chat_ids = _project_chat_ids(db, project_id)
+
+    if _project_has_more_messages(db, project_id, settings.PROJECT_PURGE_ASYNC_MESSAGES):
+        now = datetime.utcnow()
+        db.execute(update(Project).where(Project.id == project_id).values(deleted_at=now))
+        db.execute(
+            update(Chat)
+            .where(Chat.project_id == project_id, Chat.deleted_at.is_(None))
+            .values(deleted_at=now)
+        )
+        _detach_telegram(db, project_id, with_chats=True)
+        db.commit()
+        invalidate_chat_owner(*chat_ids)
+
+        try:
+            from ..worker.task import purge_project_async
+            purge_project_async.send(project_id)
+            return True
+        except Exception as e:
+            # без задачі проект лишився б прихованим назавжди
+            print(f"[ProjectPurge] enqueue failed for project {project_id}: {e}; purging inline")
+            _purge(db, project_id)
+            return False
+
+    _detach_telegram(db, project_id, with_chats=True)
+    db.execute(delete(Chat).where(Chat.project_id == project_id))
+    db.execute(delete(Project).where(Project.id == project_id))
+    db.commit()
+    invalidate_chat_owner(*chat_ids)
+    return False
+
+def _purge(db: Session, project_id: int) -> None:
+    # чати пачками по PROJECT_PURGE_BATCH_CHATS (коміт на пачку — не тримаємо
+    # довгу транзакцію і write-lock SQLite), потім сам проект
+    while True:
+        ids = list(db.scalars(_project_chats(project_id).limit(settings.PROJECT_PURGE_BATCH_CHATS)))
+        if not ids:
+            break
+        db.execute(
+            update(TelegramAccount)
+            .where(TelegramAccount.active_chat_id.in_(ids))
+            .values(active_chat_id=None)
+        )
+        db.execute(delete(Chat).where(Chat.id.in_(ids)))
+        db.commit()
+    db.execute(delete(Project).where(Project.id == project_id))
+    db.commit()
+    print(f"[ProjectPurge] project {project_id} purged")
+
+def purge_project(project_id: int) -> None:
+    """Worker-side: фонове видалення проекту, позначеного delete_project_hard."""
+    db: Session = SessionLocal()
+    try:
+        _purge(db, project_id)
+    finally:
+        db.close()
+
+def resume_project_purges() -> None:
+    """
+    Reconcile на старті: проекти з deleted_at, чий purge не завершився
+    (процес упав між commit і send, воркер вичерпав ретраї), ставимо в чергу знову.
+    purge_project ідемпотентний — повторна задача для вже видаленого проекту нічого не робить.
+    """
+    db: Session = SessionLocal()
+    try:
+        pending = list(db.scalars(select(Project.id).where(Project.deleted_at.is_not(None))))
+        if not pending:
+            return
+        from ..worker.task import purge_project_async
+        for project_id in pending:
+            purge_project_async.send(project_id)
+        print(f"[ProjectPurge] re-queued {len(pending)} pending project purge(s)")
+    except Exception as e:
+        print(f"[ProjectPurge] could not re-queue pending purges: {e}")
+    finally:
+        db.close()
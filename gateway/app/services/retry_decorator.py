@@ -1,33 +1,101 @@
 # app/services/retry_decorator.py
+import asyncio
 from time import sleep
 from .llm_port import LLMClient
+from .circuit_breaker import breakers, breaker_name
+from .retry_policy import RetryPolicy
 
 class RetryDecorator(LLMClient):
     """
-    Обгортка над будь-яким LLMClient, що повторює запит при помилці.
+    Обгортка над будь-яким LLMClient, що повторює запит при тимчасовій помилці.
+    Коли і скільки чекати — вирішує RetryPolicy.
+    Стрім повторюється лише доки клієнту не віддано жодного чанка.
     """
-    def __init__(self, client: LLMClient, retries: int = 2, delay: float = 0.5):
+    def __init__(self, client: LLMClient, retries: int = 2, delay: float = 0.5,
+                 policy: RetryPolicy | None = None):
         self.client = client
-        self.retries = retries
-        self.delay = delay
+        self.policy = policy or RetryPolicy(retries=retries, base_delay=delay)
+        self.model = breaker_name(client)
+
+    def fingerprint(self, **kw):
+        return self.client.fingerprint(**kw)
+
+    def _next_delay(self, attempt: int, exc: Exception) -> float | None:
+        # брейкер моделі вже відкритий — ретрай лише додасть навантаження
+        if self.model is not None and not breakers.available(self.model):
+            return None
+        return self._policy_delay(attempt, exc)
+
+    def _policy_delay(self, attempt: int, exc: Exception) -> float | None:
+        delay = self.policy.next_delay(attempt, exc)
+        if delay is not None:
+            print(f"[RetryDecorator] Error: {exc} → retrying {attempt+1}/{self.policy.retries} in {delay:.2f}s")
+        return delay
+
+    async def _anext_delay(self, attempt: int, exc: Exception) -> float | None:
+        if self.model is not None and not await breakers.aavailable(self.model):
+            return None
+        return self._policy_delay(attempt, exc)
 
     def generate(self, prompt: str, **kw):
-        for attempt in range(self.retries + 1):
+        self.policy.budget.record_request()
+        attempt = 0
+        while True:
             try:
                 return self.client.generate(prompt, **kw)
             except Exception as e:
-                if attempt == self.retries:
+                delay = self._next_delay(attempt, e)
+                if delay is None:
                     raise
-                print(f"[RetryDecorator] Error: {e} → retrying {attempt+1}/{self.retries}")
-                sleep(self.delay)
+                sleep(delay)
+                attempt += 1
 
     def chat_stream(self, messages, **kw):
-        for attempt in range(self.retries + 1):
+        self.policy.budget.record_request()
+        attempt = 0
+        while True:
+            emitted = False
+            try:
+                for chunk in self.client.chat_stream(messages, **kw):
+                    emitted = True
+                    yield chunk
+                return
+            except Exception as e:
+                # частину відповіді вже віддано — повтор продублював би текст
+                delay = None if emitted else self._next_delay(attempt, e)
+                if delay is None:
+                    raise
+                sleep(delay)
+                attempt += 1
+
+    # async: пауза між спробами через asyncio.sleep — event loop не блокується
+
+    async def agenerate(self, prompt: str, **kw):
+        self.policy.budget.record_request()
+        attempt = 0
+        while True:
+            try:
+                return await self.client.agenerate(prompt, **kw)
+            except Exception as e:
+                delay = await self._anext_delay(attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def achat_stream(self, messages, **kw):
+        self.policy.budget.record_request()
+        attempt = 0
+        while True:
+            emitted = False
             try:
-                yield from self.client.chat_stream(messages, **kw)
-                break
+                async for chunk in self.client.achat_stream(messages, **kw):
+                    emitted = True
+                    yield chunk
+                return
             except Exception as e:
-                if attempt == self.retries:
+                delay = None if emitted else await self._anext_delay(attempt, e)
+                if delay is None:
                     raise
-                print(f"[RetryDecorator] Error: {e} → retrying {attempt+1}/{self.retries}")
-                sleep(self.delay)
+                await asyncio.sleep(delay)
+                attempt += 1
@@ -0,0 +1,134 @@
+# app/services/retry_policy.py
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from google.api_core import exceptions as gexc
+
+from ..core.config import settings
+
+class LLMUnavailableError(RuntimeError):
+    """
+    Жодна модель не дала відповіді. Остання помилка провайдера — у __cause__,
+    за нею RetryPolicy вирішує, чи є сенс повторювати.
+    """
+
+# 429 / 5xx / таймаути / мережа — тимчасові; решта (ключ, невалідний запит) — фатальні
+_RETRIABLE = (
+    gexc.TooManyRequests,
+    gexc.ServerError,
+    gexc.DeadlineExceeded,
+    TimeoutError,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+def _root(exc: BaseException) -> BaseException:
+    while isinstance(exc, LLMUnavailableError) and exc.__cause__ is not None:
+        exc = exc.__cause__
+    return exc
+
+class RetryBudget:
+    """
+    Глобальний бюджет ретраїв (token bucket): кожен запит додає `ratio` токена,
+    кожен ретрай забирає 1. Плюс невеликий резерв `min_per_second`, щоб
+    поодинокі запити теж могли ретраїтися. Коли провайдер лежить,
+    ретраї не множать навантаження більше ніж на `ratio`.
+    """
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1.0, max_tokens: float = 50.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated_at) * self.min_per_second)
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+class RetryPolicy:
+    """
+    Коли і скільки чекати перед повтором:
+      - класифікація помилок (retriable vs fatal)
+      - exponential backoff з full jitter
+      - Retry-After від провайдера (HTTP-заголовок або gRPC RetryInfo)
+      - спільний RetryBudget
+    """
+    def __init__(
+        self,
+        retries: int = 2,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        max_retry_after: float = 30.0,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else retry_budget
+
+    @staticmethod
+    def is_retriable(exc: BaseException) -> bool:
+        return isinstance(_root(exc), _RETRIABLE)
+
+    @staticmethod
+    def retry_after(exc: BaseException) -> Optional[float]:
+        exc = _root(exc)
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+        raw = headers.get("Retry-After") if headers else None
+        if raw:
+            try:
+                return max(0.0, float(raw))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        for detail in getattr(exc, "details", None) or []:
+            delay = getattr(detail, "retry_delay", None)
+            if delay is not None:
+                return delay.seconds + delay.nanos / 1e9
+        return None
+
+    def backoff(self, attempt: int, exc: BaseException) -> float:
+        hinted = self.retry_after(exc)
+        if hinted is not None:
+            return hinted
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def next_delay(self, attempt: int, exc: BaseException) -> Optional[float]:
+        """Пауза перед наступною спробою, або None — якщо повторювати не можна."""
+        if attempt >= self.retries or not self.is_retriable(exc):
+            return None
+        delay = self.backoff(attempt, exc)
+        if delay > self.max_retry_after:
+            # провайдер просить чекати довше, ніж ми готові тримати запит
+            return None
+        if not self.budget.try_spend():
+            print("[RetryPolicy] retry budget exhausted")
+            return None
+        return delay
+
+retry_budget = RetryBudget(
+    ratio=settings.LLM_RETRY_BUDGET_RATIO,
+    min_per_second=settings.LLM_RETRY_BUDGET_MIN_PER_SECOND,
+)
@@ -0,0 +1,192 @@
+# app/services/single_flight.py
+import asyncio
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional
+
+from ..core.config import settings
+from ..core.redis_cache import get_async_redis, get_redis
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Об'єднання однакових запитів, що виконуються одночасно (single-flight):
+    перший («лідер») робить виклик, решта чекають і отримують його результат.
+
+    - у процесі: потоки (do) і корутини (ado) з однаковим ключем
+    - між воркерами (опційно, use_redis): лідер бере Redis-лок і публікує результат
+      під коротким TTL; інші воркери опитують ключ результату. Якщо лідер упав
+      і лок зник без результату — виконуємо запит самі.
+    """
+    def __init__(
+        self,
+        use_redis: bool = False,
+        lock_ttl_seconds: int = 120,
+        result_ttl_seconds: int = 30,
+        poll_interval: float = 0.1,
+    ):
+        self.use_redis = use_redis
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.poll_interval = poll_interval
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    # --------- Redis (між воркерами) ---------
+    def _redis(self):
+        return get_redis() if self.use_redis else None
+
+    def _aredis(self):
+        return get_async_redis() if self.use_redis else None
+
+    def _try_lock(self, r, key: str, token: str) -> bool:
+        try:
+            return bool(r.set(f"sf:{key}:lock", token, nx=True, ex=self.lock_ttl_seconds))
+        except Exception:
+            return True  # Redis недоступний — працюємо як без нього
+
+    def _poll(self, r, key: str) -> tuple[bool, Optional[str]]:
+        """(чекати далі?, результат)"""
+        try:
+            pipe = r.pipeline()
+            pipe.get(f"sf:{key}:result")
+            pipe.exists(f"sf:{key}:lock")
+            result, locked = pipe.execute()
+        except Exception:
+            return False, None
+        if result is not None:
+            return False, result
+        return bool(locked), None
+
+    def _publish(self, r, key: str, token: str, result: Optional[str]) -> None:
+        try:
+            if result is not None:
+                r.setex(f"sf:{key}:result", self.result_ttl_seconds, result)
+            if r.get(f"sf:{key}:lock") == token:
+                r.delete(f"sf:{key}:lock")
+        except Exception:
+            pass
+
+    # те саме через redis.asyncio — для ado(), event loop не блокується
+
+    async def _atry_lock(self, r, key: str, token: str) -> bool:
+        try:
+            return bool(await r.set(f"sf:{key}:lock", token, nx=True, ex=self.lock_ttl_seconds))
+        except Exception:
+            return True
+
+    async def _apoll(self, r, key: str) -> tuple[bool, Optional[str]]:
+        try:
+            pipe = r.pipeline()
+            pipe.get(f"sf:{key}:result")
+            pipe.exists(f"sf:{key}:lock")
+            result, locked = await pipe.execute()
+        except Exception:
+            return False, None
+        if result is not None:
+            return False, result
+        return bool(locked), None
+
+    async def _apublish(self, r, key: str, token: str, result: Optional[str]) -> None:
+        try:
+            if result is not None:
+                await r.setex(f"sf:{key}:result", self.result_ttl_seconds, result)
+            if await r.get(f"sf:{key}:lock") == token:
+                await r.delete(f"sf:{key}:lock")
+        except Exception:
+            pass
+
+    def _run_leader(self, key: str, fn: Callable[[], str]) -> str:
+        r = self._redis()
+        if r is None:
+            return fn()
+        token = uuid.uuid4().hex
+        while not self._try_lock(r, key, token):
+            # запит уже виконує інший воркер — чекаємо його результат, доки тримається лок
+            while True:
+                waiting, result = self._poll(r, key)
+                if result is not None:
+                    return result
+                if not waiting:
+                    break
+                time.sleep(self.poll_interval)
+        result = None
+        try:
+            result = fn()
+            return result
+        finally:
+            self._publish(r, key, token, result)
+
+    async def _arun_leader(self, key: str, fn: Callable[[], Awaitable[str]]) -> str:
+        r = self._aredis()
+        if r is None:
+            return await fn()
+        token = uuid.uuid4().hex
+        while not await self._atry_lock(r, key, token):
+            while True:
+                waiting, result = await self._apoll(r, key)
+                if result is not None:
+                    return result
+                if not waiting:
+                    break
+                await asyncio.sleep(self.poll_interval)
+        result = None
+        try:
+            result = await fn()
+            return result
+        finally:
+            await self._apublish(r, key, token, result)
+
+    # --------- в межах процесу ---------
+    def do(self, key: str, fn: Callable[[], str]) -> str:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_leader(key, fn)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[str]]) -> str:
+        task = self._tasks.get(key)
+        if task is None:
+            # спільний виклик живе в окремій задачі: відключення клієнта-лідера
+            # не скасовує відповідь для інших очікувачів
+            task = asyncio.ensure_future(self._arun_leader(key, fn))
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # без "Task exception was never retrieved", якщо всі пішли
+
+single_flight = SingleFlight(
+    use_redis=settings.LLM_SINGLE_FLIGHT_REDIS,
+    lock_ttl_seconds=settings.LLM_SINGLE_FLIGHT_LOCK_TTL_SECONDS,
+    result_ttl_seconds=settings.LLM_SINGLE_FLIGHT_RESULT_TTL_SECONDS,
+)
@@ -73,6 +73,7 @@ def ensure_active_chat(
 
     chat = Chat(
         user_id = account.user_id,
+        owner_user_id = account.user_id,
         title = f"Telegram chat ({account.telegram_id})",
     )
 
@@ -0,0 +1,139 @@
+# app/services/upload_storage.py
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DOC = "application/msword"
+
+_EXT = {PDF: ".pdf", DOCX: ".docx", DOC: ".doc"}
+
+# сигнатури форматів, які вміє parse_any
+_MAGIC = (
+    (b"%PDF-", PDF),
+    (b"PK\x03\x04", DOCX),  # zip-контейнер; docx — лише з розширенням .docx
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", DOC),  # OLE2 (.doc)
+)
+
+@dataclass
+class StoredUpload:
+    stored_name: str
+    path: str
+    size_bytes: int
+    sha256: str
+    mime: str
+
+def sniff_mime(head: bytes, filename: str) -> Optional[str]:
+    """MIME за magic bytes першого чанка; None — формат, який parse_any не розпізнає."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    for magic, mime in _MAGIC:
+        if head.startswith(magic):
+            if mime == DOCX and ext != ".docx":
+                return None
+            if mime == DOC and ext != ".doc":
+                return None
+            return mime
+    return None
+
+def _safe_name(filename: Optional[str]) -> str:
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    return name or "upload"
+
+def _extension(mime: str, filename: str) -> str:
+    ext = _EXT.get(mime)
+    if ext is None:
+        # невідомий формат — розширення клієнта (лише [a-z0-9]), як було до content-addressing
+        ext = os.path.splitext(filename)[1].lower()
+        if not ext[1:].isalnum():
+            ext = ""
+    return ext
+
+def content_address(sha256: str, mime: str, filename: str = "") -> str:
+    """<sha[:2]>/<sha><ext>: розширення потрібне parse_any (напр. .doc)."""
+    return f"{sha256[:2]}/{sha256}{_extension(mime, filename)}"
+
+def _publish(part: str, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        # такий самий вміст уже лежить у сховищі — копію не тримаємо
+        _remove(part)
+    else:
+        os.replace(part, path)
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+async def save_upload(
+    f: UploadFile,
+    directory: str,
+    *,
+    max_bytes: int,
+    chunk_size: int,
+) -> StoredUpload:
+    """
+    Потокове збереження upload'у: читаємо чанками по chunk_size, рахуємо SHA-256
+    інкрементально, пишемо у .part через threadpool (event loop не блокується),
+    після останнього чанка — атомарний os.replace у content-addressed шлях
+    directory/<sha[:2]>/<sha><ext>; однаковий вміст зберігається один раз.
+    Понад max_bytes → 413 (.part видаляється).
+
+    MIME визначається за magic bytes (PDF/DOCX/DOC); файли інших форматів приймаються,
+    як і раніше, з Content-Type клієнта — їх відхиляє вже воркер (status=failed).
+
+    Ліміт тут рахує байти файлу, але спрацьовує лише після того, як Starlette
+    уже прочитав увесь multipart-запит у свій SpooledTemporaryFile. Тому тіло
+    запиту обмежується раніше — BodySizeLimitMiddleware (Content-Length і
+    лічильник байтів під час прийому); ця перевірка — точний ліміт на сам файл.
+    """
+    original = _safe_name(f.filename)
+    await run_in_threadpool(os.makedirs, directory, exist_ok=True)
+    part = os.path.join(directory, f"{uuid4().hex}.part")
+
+    hasher = hashlib.sha256()
+    size = 0
+    mime: Optional[str] = None
+    out = await run_in_threadpool(open, part, "wb")
+    try:
+        while True:
+            chunk = await f.read(chunk_size)
+            if not chunk:
+                break
+            if mime is None:
+                mime = sniff_mime(chunk, original) or f.content_type or "application/octet-stream"
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                    detail=f"File is larger than {max_bytes} bytes")
+            hasher.update(chunk)
+            await run_in_threadpool(out.write, chunk)
+
+        if mime is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty file")
+
+        sha256 = hasher.hexdigest()
+        stored = content_address(sha256, mime, original)
+        path = os.path.join(directory, stored)
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(_publish, part, path)
+    except BaseException:
+        # синхронно: при скасуванні запиту await тут уже не виконається
+        out.close()
+        _remove(part)
+        raise
+
+    return StoredUpload(
+        stored_name=stored,
+        path=path,
+        size_bytes=size,
+        sha256=sha256,
+        mime=mime,
+    )
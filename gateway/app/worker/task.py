@@ -2,6 +2,8 @@
 import os,dramatiq
 from dramatiq.brokers.redis import RedisBroker
 from ..services.pipeline import process_document
+from ..services.chat_summary import update_chat_summary
+from ..services.project_deletion import purge_project
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 dramatiq.set_broker(RedisBroker(url=REDIS_URL))
@@ -10,6 +12,14 @@ dramatiq.set_broker(RedisBroker(url=REDIS_URL))
 def parse_document_async(document_id: int):
     process_document(document_id)
 
+@dramatiq.actor(max_retries=1)
+def summarize_chat_async(chat_id: int):
+    update_chat_summary(chat_id)
+
+@dramatiq.actor(max_retries=3)
+def purge_project_async(project_id: int):
+    purge_project(project_id)
+
 """
     db: Session = SessionLocal()
     try:
@@ -0,0 +1,143 @@
+"""
+Chunk write throughput of process_document on a synthetic PDF.
+
+1. Builds a text PDF with --pages pages (~40 lines each) and runs the real
+   process_document (pdfplumber + chunk writes) with DOCUMENT_CHUNK_BATCH_SIZE=1
+   and with --batch-size.
+2. Write-only: the chunks parsed from that PDF, repeated up to --chunks rows,
+   inserted the old way (ORM db.add per chunk, one commit) and with batched
+   executemany inserts — so the write path is measured without the parser.
+
+    cd gateway && python scripts/bench_chunks.py [--pages 100] [--chunks 5000] [--batch-size 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+GATEWAY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_pdf(path: str, pages: int, lines: int = 40) -> None:
+    """Minimal valid PDF with one Helvetica text stream per page (no dependencies)."""
+    objs: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objs.append(body)
+        return len(objs)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    contents = []
+    for p in range(pages):
+        text = b"BT /F1 10 Tf 40 800 Td 12 TL " + b" ".join(
+            b"(Page %d line %d lorem ipsum dolor sit amet consectetur adipiscing) '" % (p + 1, i)
+            for i in range(lines)
+        ) + b" ET"
+        contents.append(add(b"<< /Length %d >>\nstream\n" % len(text) + text + b"\nendstream"))
+    pages_id = len(objs) + pages + 1
+    kids = [
+        add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content, font))
+        for content in contents
+    ]
+    add(b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids) + b"] /Count %d >>" % pages)
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    info = add(b"<< /Title (Synthetic) /Author (bench) >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objs) + 1, catalog, info, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--chunks", type=int, default=5000, help="rows for the write-only pass")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_chunks_")
+    os.environ["DB_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault("SQLITE_PROFILE", "performance")
+    sys.path.insert(0, GATEWAY_DIR)
+
+    from sqlalchemy import delete, func, select
+
+    from app.core.config import settings
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    import app.models.chat, app.models.telegram_account, app.models.user  # noqa: F401
+    from app.models.document import Document, DocumentChunk
+    from app.services.parsers import parse_any
+    from app.services.pipeline import _insert_chunks, process_document
+
+    Base.metadata.create_all(bind=engine)
+    pdf_path = os.path.join(workdir, "synthetic.pdf")
+    make_pdf(pdf_path, args.pages)
+
+    def new_document() -> int:
+        with SessionLocal() as db:
+            doc = Document(user_id=1, original_name="synthetic.pdf", stored_name="synthetic.pdf",
+                           mime="application/pdf", size_bytes=os.path.getsize(pdf_path),
+                           sha256=os.urandom(32).hex(), path=pdf_path, status="queued")
+            db.add(doc)
+            db.commit()
+            return doc.id
+
+    print(f"process_document, {args.pages}-page synthetic PDF (parse + write):")
+    for batch_size in (1, args.batch_size):
+        settings.DOCUMENT_CHUNK_BATCH_SIZE = batch_size
+        doc_id = new_document()
+        started = time.perf_counter()
+        process_document(doc_id)
+        elapsed = time.perf_counter() - started
+        with SessionLocal() as db:
+            status = db.get(Document, doc_id).status
+            rows = db.scalar(select(func.count()).where(DocumentChunk.document_id == doc_id))
+        print(f"  batch={batch_size:<5} {rows} chunks in {elapsed:.2f}s -> {rows / elapsed:,.0f} chunks/s ({status})")
+
+    _, parsed = parse_any(pdf_path, "application/pdf")
+    parsed = list(parsed)
+    doc_id = new_document()
+    rows = [
+        {"document_id": doc_id, "seq": i, "text": parsed[i % len(parsed)]["text"],
+         "page_from": i + 1, "page_to": i + 1}
+        for i in range(args.chunks)
+    ]
+
+    def reset():
+        with SessionLocal() as db:
+            db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == doc_id))
+            db.commit()
+
+    print(f"write only, {len(rows)} chunks of parsed page text:")
+    reset()
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        for row in rows:
+            db.add(DocumentChunk(**row))
+        db.commit()
+        elapsed = time.perf_counter() - started
+    print(f"  ORM add per chunk     {elapsed:.2f}s -> {len(rows) / elapsed:,.0f} chunks/s")
+
+    reset()
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        for i in range(0, len(rows), args.batch_size):
+            _insert_chunks(db, rows[i:i + args.batch_size])
+        elapsed = time.perf_counter() - started
+    print(f"  executemany batch={args.batch_size:<4} {elapsed:.2f}s -> {len(rows) / elapsed:,.0f} chunks/s")
+
+
+if __name__ == "__main__":
+    main()
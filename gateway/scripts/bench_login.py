@@ -0,0 +1,97 @@
+"""
+Login throughput and chat-side latency during a login storm.
+
+C concurrent clients hammer POST /auth/login for D seconds while a probe
+client calls an authenticated endpoint every 50 ms. Runs twice:
+PASSWORD_HASH_WORKERS=0 (argon2 in the shared threadpool, as before the
+process pool) and PASSWORD_HASH_WORKERS=<n> (dedicated process pool).
+In-process ASGI transport, no network.
+
+    cd gateway && python scripts/bench_login.py [--concurrency 16] [--duration 10] [--workers 2]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+GATEWAY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CREDENTIALS = {"email": "bench@example.com", "password": "bench-password"}
+
+
+async def _storm(concurrency: int, duration: float) -> str:
+    import httpx
+
+    import app.main as main
+    from app.db.base import Base
+    from app.db.session import engine
+
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=main.app)
+    base_url = "http://testserver"
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=120) as probe_client:
+        await probe_client.post("/api/v1/auth/register", json=CREDENTIALS)
+        await probe_client.post("/api/v1/auth/login", json=CREDENTIALS)
+        await probe_client.get("/api/v1/settings/llm")
+
+        stop = time.perf_counter() + duration
+        codes: dict[int, int] = {}
+        latencies: list[float] = []
+
+        async def login_loop():
+            async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=120) as c:
+                while time.perf_counter() < stop:
+                    r = await c.post("/api/v1/auth/login", json=CREDENTIALS)
+                    codes[r.status_code] = codes.get(r.status_code, 0) + 1
+
+        async def probe():
+            while time.perf_counter() < stop:
+                t = time.perf_counter()
+                await probe_client.get("/api/v1/settings/llm")
+                latencies.append((time.perf_counter() - t) * 1000)
+                await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[login_loop() for _ in range(concurrency)], probe())
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return (
+        f"logins/s={codes.get(200, 0) / elapsed:.1f} codes={dict(sorted(codes.items()))} "
+        f"probe p50={statistics.median(latencies):.1f}ms "
+        f"p95={latencies[int(len(latencies) * 0.95)]:.1f}ms n={len(latencies)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS for the pool run")
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        sys.path.insert(0, GATEWAY_DIR)
+        print(asyncio.run(_storm(args.concurrency, args.duration)))
+        return
+
+    # one process per mode: settings are read once, at import time
+    for workers in (0, args.workers):
+        db_path = os.path.join(tempfile.mkdtemp(prefix="bench_login_"), "bench.db")
+        env = dict(os.environ, DB_URL=f"sqlite:///{db_path}", PASSWORD_HASH_WORKERS=str(workers))
+        label = "threadpool" if workers == 0 else f"pool x{workers}"
+        print(f"{label:<12}", end=" ", flush=True)
+        subprocess.run(
+            [sys.executable, __file__, "--run", "--concurrency", str(args.concurrency),
+             "--duration", str(args.duration)],
+            env=env, check=True,
+        )
+
+
+# __main__ guard: the spawn-based hashing pool re-imports this module in its workers
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Concurrent SQLite writes under SQLITE_PROFILE=default vs performance.
+
+API side: N threads insert chat messages (one commit per message).
+Worker side: a separate process inserts document chunks at the same time,
+like the dramatiq worker parsing a document while users chat.
+
+    cd gateway && python scripts/bench_sqlite.py [--threads 8] [--messages 200] [--chunks 2000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+GATEWAY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _setup_app(db_path: str, profile: str):
+    os.environ["DB_URL"] = f"sqlite:///{db_path}"
+    os.environ["SQLITE_PROFILE"] = profile
+    sys.path.insert(0, GATEWAY_DIR)
+
+
+def _write_chunks(doc_id: int, count: int) -> int:
+    from app.db.session import SessionLocal
+    from app.models.document import DocumentChunk
+
+    errors = 0
+    for i in range(count):
+        with SessionLocal() as s:
+            try:
+                s.add(DocumentChunk(document_id=doc_id, seq=i, text="y" * 500))
+                s.commit()
+            except Exception:
+                errors += 1
+    return errors
+
+
+def run_profile(profile: str, args) -> str:
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench_sqlite_"), f"{profile}.db")
+    _setup_app(db_path, profile)
+    from datetime import datetime
+
+    from sqlalchemy import text
+
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    import app.models.telegram_account  # noqa: F401
+    from app.models.chat import Chat, Message
+    from app.models.document import Document
+    from app.models.user import User
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as s:
+        user = User(email="bench@example.com", password_hash="x")
+        s.add(user)
+        s.commit()
+        chat = Chat(user_id=user.id, title="bench")
+        doc = Document(user_id=user.id, original_name="f", stored_name="f", mime="x",
+                       size_bytes=1, sha256="0", path="f", status="processing")
+        s.add_all([chat, doc])
+        s.commit()
+        chat_id, doc_id = chat.id, doc.id
+
+    errors = [0]
+
+    def write_messages():
+        for _ in range(args.messages):
+            with SessionLocal() as s:
+                try:
+                    s.add(Message(chat_id=chat_id, role="user", content="x" * 200, created_at=datetime.utcnow()))
+                    s.commit()
+                except Exception:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    worker = subprocess.Popen(
+        [sys.executable, __file__, "--worker", db_path, profile, str(doc_id), str(args.chunks)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    threads = [threading.Thread(target=write_messages) for _ in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    messages_time = time.perf_counter() - started
+    chunk_errors = worker.communicate()[0].strip()
+    total_time = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        messages = conn.execute(text("SELECT COUNT(*) FROM messages")).scalar()
+        chunks = conn.execute(text("SELECT COUNT(*) FROM document_chunks")).scalar()
+    return (
+        f"{profile:<12} messages {messages}/{args.threads * args.messages} in {messages_time:.2f}s "
+        f"(errors {errors[0]}), chunks {chunks}/{args.chunks} (errors {chunk_errors}), "
+        f"total {total_time:.2f}s"
+    )
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        db_path, profile, doc_id, count = sys.argv[2:6]
+        _setup_app(db_path, profile)
+        print(_write_chunks(int(doc_id), int(count)))
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--profile":
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--profile")
+        parser.add_argument("--threads", type=int)
+        parser.add_argument("--messages", type=int)
+        parser.add_argument("--chunks", type=int)
+        args = parser.parse_args()
+        print(run_profile(args.profile, args))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=200, help="messages per thread")
+    parser.add_argument("--chunks", type=int, default=2000, help="chunks written by the worker process")
+    args = parser.parse_args()
+    # one process per profile: settings are read once, at import time
+    for profile in ("default", "performance"):
+        subprocess.run(
+            [sys.executable, __file__, "--profile", profile, "--threads", str(args.threads),
+             "--messages", str(args.messages), "--chunks", str(args.chunks)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+import warnings
+
+import pytest
+import requests
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", FutureWarning)
+    import google.generativeai as genai
+from google.ai import generativelanguage as glm
+from google.ai.generativelanguage_v1beta.services.generative_service.async_client import (
+    GenerativeServiceAsyncClient,
+)
+
+from app.services.gemini_client import GeminiClient
+
+KEYS = ("key-A", "key-B")
+
+
+def _echo_key_response(request):
+    # ответ модели = ключ, с которым пришёл HTTP-запрос
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers["content-type"] = "application/json"
+    resp._content = json.dumps({"candidates": [{
+        "content": {"role": "model", "parts": [{"text": request.headers.get("x-goog-api-key")}]},
+        "finishReason": "STOP",
+    }]}).encode()
+    resp.request, resp.url = request, request.url
+    return resp
+
+
+def test_parallel_requests_use_their_own_key(monkeypatch):
+    monkeypatch.setattr(requests.Session, "send", lambda self, request, **kw: _echo_key_response(request))
+    clients = {key: GeminiClient(key, transport="rest") for key in KEYS}
+    rounds = 20
+    barrier = threading.Barrier(len(KEYS) * 2)
+    seen: dict[str, list] = {key: [] for key in KEYS}
+
+    def worker(key):
+        barrier.wait()
+        for _ in range(rounds):
+            llm = clients[key].model("gemini-2.5-flash", {"temperature": 0})
+            seen[key].append(llm.start_chat(history=[]).send_message("hi").text)
+
+    threads = [threading.Thread(target=worker, args=(key,)) for key in KEYS * 2]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for key in KEYS:
+        assert seen[key] == [key] * rounds * 2
+
+
+def test_parallel_async_requests_use_their_own_key(monkeypatch):
+    async def generate_content(self, request=None, **kw):
+        key = self._client._client_options.api_key
+        await asyncio.sleep(0)
+        return glm.GenerateContentResponse({"candidates": [{
+            "content": {"role": "model", "parts": [{"text": key}]},
+            "finish_reason": 1,
+        }]})
+
+    monkeypatch.setattr(GenerativeServiceAsyncClient, "generate_content", generate_content)
+
+    async def ask(client):
+        llm = client.model("gemini-2.5-flash", {"temperature": 0}, is_async=True)
+        resp = await llm.start_chat(history=[]).send_message_async("hi")
+        return resp.text
+
+    async def main():
+        clients = [GeminiClient(key) for key in KEYS]
+        return await asyncio.gather(*[ask(clients[i % 2]) for i in range(20)])
+
+    assert asyncio.run(main()) == [KEYS[i % 2] for i in range(20)]
+
+
+def test_global_configure_does_not_leak_into_client(monkeypatch):
+    monkeypatch.setattr(requests.Session, "send", lambda self, request, **kw: _echo_key_response(request))
+    client = GeminiClient("key-A", transport="rest")
+    genai.configure(api_key="global-key", transport="rest")
+    try:
+        llm = client.model("gemini-2.5-flash", {"temperature": 0})
+        assert llm.start_chat(history=[]).send_message("hi").text == "key-A"
+    finally:
+        genai.configure(api_key=None)
+
+
+def test_unsupported_sdk_version_fails_loudly(monkeypatch):
+    monkeypatch.setattr(genai, "__version__", "0.9.0")
+    with pytest.raises(RuntimeError, match="not supported"):
+        GeminiClient("key-A")
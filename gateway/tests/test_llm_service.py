@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.api_core import exceptions as gexc
+
+from app.services import llm_service
+from app.services.circuit_breaker import CLOSED, OPEN, CircuitBreakerRegistry
+from app.services.retry_policy import LLMUnavailableError
+
+MODELS = ("gemini-2.5-pro", "gemini-2.5-flash", "gemini-2.5-flash-lite")
+
+
+class _FakeGemini:
+    # "bad-key" — як справжній Gemini з невалідним ключем, "down" — провайдер лежить
+    def __init__(self, api_key, transport=None):
+        self.api_key = api_key
+
+    def model(self, name, generation_config, *, is_async=False):
+        return self
+
+    def start_chat(self, history):
+        return self
+
+    def send_message(self, text, stream=False):
+        if self.api_key == "bad-key":
+            raise gexc.PermissionDenied("API key not valid")
+        if self.api_key == "down":
+            raise gexc.ServiceUnavailable("overloaded")
+        return SimpleNamespace(text=f"reply for {self.api_key}")
+
+    async def send_message_async(self, text, stream=False):
+        return self.send_message(text, stream)
+
+
+@pytest.fixture
+def breakers(monkeypatch):
+    registry = CircuitBreakerRegistry(window=20, min_calls=5, error_rate=0.5, cooldown_seconds=30)
+    monkeypatch.setattr(llm_service, "breakers", registry)
+    monkeypatch.setattr(llm_service, "GeminiClient", _FakeGemini)
+    monkeypatch.setattr(
+        llm_service, "get_or_create_settings",
+        lambda db, user_id: SimpleNamespace(temperature=0, max_tokens=64, default_model=None),
+    )
+    keys = {1: "bad-key", 2: "good-key", 3: "down"}
+    monkeypatch.setattr(llm_service, "get_api_key", lambda db, user_id, provider: keys[user_id])
+    return registry
+
+
+def _ask(user_id):
+    return llm_service.LLMService(None, user_id).complete([{"role": "user", "content": "hi"}])
+
+
+def test_bad_key_does_not_open_breakers_for_other_users(breakers):
+    for _ in range(6):
+        with pytest.raises(gexc.PermissionDenied):
+            _ask(1)
+
+    assert [breakers.state(m) for m in MODELS] == [CLOSED] * 3
+    assert _ask(2) == "reply for good-key"
+
+
+def test_bad_key_does_not_open_breakers_async(breakers):
+    async def main():
+        bad = llm_service.LLMService(None, 1)
+        for _ in range(6):
+            with pytest.raises(gexc.PermissionDenied):
+                await bad.acomplete([{"role": "user", "content": "hi"}])
+        return await llm_service.LLMService(None, 2).acomplete([{"role": "user", "content": "hi"}])
+
+    assert asyncio.run(main()) == "reply for good-key"
+    assert [breakers.state(m) for m in MODELS] == [CLOSED] * 3
+
+
+def test_provider_errors_still_open_breakers(breakers):
+    for _ in range(5):
+        with pytest.raises(LLMUnavailableError):
+            _ask(3)
+
+    assert [breakers.state(m) for m in MODELS] == [OPEN] * 3
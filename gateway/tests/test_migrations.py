@@ -0,0 +1,56 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+GATEWAY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(db_path, *args):
+    env = dict(os.environ, DB_URL=f"sqlite:///{db_path}", SQLITE_PROFILE="default")
+    subprocess.run([sys.executable, *args], cwd=GATEWAY_DIR, env=env, check=True, capture_output=True)
+
+
+def _counts(db_path):
+    con = sqlite3.connect(db_path)
+    try:
+        return {t: con.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                for t in ("users", "projects", "chats", "messages", "chat_summaries")}
+    finally:
+        con.close()
+
+
+def test_upgrade_keeps_rows_of_populated_database(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    # БД на ревизии до пересборки chats (0003) с данными во всех связанных таблицах
+    _run(db_path, "-m", "alembic", "upgrade", "0002")
+
+    con = sqlite3.connect(db_path)
+    con.execute("INSERT INTO users (id, email, password_hash, role, is_active) VALUES (1, 'a@b.c', 'x', 'user', 1)")
+    con.execute("INSERT INTO projects (id, user_id, name, created_at) VALUES (1, 1, 'p', '2024-01-01')")
+    for chat_id, project_id, user_id in ((1, 1, None), (2, None, 1)):
+        con.execute(
+            "INSERT INTO chats (id, user_id, project_id, title, provider, model, created_at) "
+            "VALUES (?, ?, ?, 't', 'gemini', 'm', '2024-01-01')",
+            (chat_id, user_id, project_id),
+        )
+    for i in range(10):
+        con.execute(
+            "INSERT INTO messages (chat_id, role, content, created_at) VALUES (?, 'user', 'hi', '2024-01-01')",
+            (1 + i % 2,),
+        )
+    con.execute("INSERT INTO chat_summaries (chat_id, summary, upto_message_id, updated_at) "
+                "VALUES (1, 's', 3, '2024-01-01')")
+    con.commit()
+    con.close()
+    before = _counts(db_path)
+
+    _run(db_path, "-m", "app.db.migrate")
+
+    assert _counts(db_path) == before
+    con = sqlite3.connect(db_path)
+    try:
+        assert con.execute("SELECT id, owner_user_id FROM chats ORDER BY id").fetchall() == [(1, 1), (2, 1)]
+        assert con.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        con.close()
@@ -0,0 +1,44 @@
+from app.core.ttl_cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_ttl():
+    clock = _Clock()
+    cache = TTLCache(maxsize=2, ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" стає найстарішим
+    cache.put("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+    clock.now += 11
+    assert cache.get("a") is None and len(cache) == 1
+
+
+def test_expires_at_only_shortens_ttl():
+    clock = _Clock()
+    cache = TTLCache(maxsize=10, ttl_seconds=60, clock=clock)
+    cache.put("short", 1, expires_at=clock.now + 5)
+    cache.put("long", 2, expires_at=clock.now + 600)
+    clock.now += 30
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_pop_where_and_disabled_cache():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    for key in ((1, "x"), (1, "y"), (2, "x")):
+        cache.put(key, key)
+    cache.pop_where(lambda key: key[0] == 1)
+    assert len(cache) == 1 and cache.get((2, "x")) == (2, "x")
+
+    disabled = TTLCache(maxsize=0, ttl_seconds=60)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None